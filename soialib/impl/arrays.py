@@ -13,15 +13,20 @@ def get_array_adapter(
     item_adapter: TypeAdapter,
     key_attributes: tuple[str, ...],
 ) -> TypeAdapter:
+    key = (item_adapter, key_attributes)
+    array_adapter = _item_to_array_adapter.get(key)
+    if array_adapter is not None:
+        return array_adapter
+    # Only create the listuple class on a cache miss: creating a class, and possibly
+    # compiling the key_items function, is expensive.
     if key_attributes:
         default_expr = item_adapter.default_expr()
         listuple_class = _new_keyed_items_class(key_attributes, default_expr)
     else:
         listuple_class = _new_listuple_class()
     array_adapter = _ArrayAdapter(item_adapter, listuple_class)
-    return _item_to_array_adapter.setdefault(
-        (item_adapter, key_attributes), array_adapter
-    )
+    _item_to_array_adapter[key] = array_adapter
+    return array_adapter
 
 
 class _ArrayAdapter(TypeAdapter):
@@ -87,13 +92,21 @@ class _ArrayAdapter(TypeAdapter):
     def from_json_expr(self, json_expr: ExprLike) -> Expr:
         listuple_class_local = Expr.local("_lstpl?", self.listuple_class)
         empty_listuple_local = Expr.local("_emp?", self.empty_listuple)
+        # Return the shared empty listuple without building an intermediate list if
+        # the JSON array is empty. The JSON is bound to a variable so the expression
+        # which produces it is only evaluated once, and len() raises an error if it
+        # is not an array. A list comprehension is faster than a generator
+        # expression here, even though it creates a temporary list.
         return Expr.join(
+            "(",
             listuple_class_local,
             "([",
             self.item_adapter.from_json_expr("_e"),
-            " for _e in ",
+            " for _e in _a]) if ",
+            Expr.local("_len", len),
+            "(_a := ",
             json_expr,
-            "] or ",
+            ") else ",
             empty_listuple_local,
             ")",
         )
@@ -15,6 +15,7 @@ class EnumAdapter(TypeAdapter):
         "gen_class",
         "private_is_enum_attr",
         "finalization_state",
+        "all_constant_fields",
     )
 
     spec: Final[_spec.Enum]
@@ -22,10 +23,13 @@ class EnumAdapter(TypeAdapter):
     private_is_enum_attr: Final[str]
     # 0: has not started; 1: in progress; 2: done
     finalization_state: int
+    # The constant fields from the spec, followed by the UNKNOWN field.
+    all_constant_fields: Final[list[_spec.ConstantField]]
 
     def __init__(self, spec: _spec.Enum):
         self.finalization_state = 0
         self.spec = spec
+        self.all_constant_fields = list(spec.constant_fields) + [_UNKNOWN_FIELD]
         base_class = self.gen_class = _make_base_class(spec)
 
         private_is_enum_attr = _name_private_is_enum_attr(spec.id)
@@ -33,9 +37,9 @@ class EnumAdapter(TypeAdapter):
         setattr(base_class, private_is_enum_attr, True)
 
         # Add the constants.
+        constant_class = _make_constant_class(base_class, hash(spec.id))
         for constant_field in self.all_constant_fields:
-            constant_class = _make_constant_class(base_class, constant_field)
-            constant = constant_class()
+            constant = constant_class(constant_field)
             setattr(base_class, constant_field.attribute, constant)
 
     def finalize(
@@ -49,10 +53,11 @@ class EnumAdapter(TypeAdapter):
         self.finalization_state = 1
 
         base_class = self.gen_class
+        record_hash = hash(self.spec.id)
 
         # Resolve the type of every value field.
         value_fields = [
-            _make_value_field(f, resolve_type_fn(f.type), base_class)
+            _make_value_field(f, resolve_type_fn(f.type), base_class, record_hash)
             for f in self.spec.value_fields
         ]
 
@@ -79,15 +84,6 @@ class EnumAdapter(TypeAdapter):
         # Mark finalization as done.
         self.finalization_state = 2
 
-    @property
-    def all_constant_fields(self) -> list[_spec.ConstantField]:
-        unknown_field = _spec.ConstantField(
-            name="?",
-            number=0,
-            _attribute="UNKNOWN",
-        )
-        return list(self.spec.constant_fields) + [unknown_field]
-
     def default_expr(self) -> Expr:
         return Expr.local("_d?", self.gen_class.UNKNOWN)
 
@@ -117,6 +113,13 @@ class EnumAdapter(TypeAdapter):
             )
 
 
+_UNKNOWN_FIELD: Final = _spec.ConstantField(
+    name="?",
+    number=0,
+    _attribute="UNKNOWN",
+)
+
+
 def _make_base_class(spec: _spec.Enum) -> type:
     record_hash = hash(spec.id)
 
@@ -153,25 +156,56 @@ def _make_base_class(spec: _spec.Enum) -> type:
     return BaseClass
 
 
-def _make_constant_class(base_class: type, spec: _spec.ConstantField) -> type:
+def _make_constant_class(base_class: type, record_hash: int) -> type:
+    """Returns the class shared by all the constants of the enum.
+
+    Creating one class per enum rather than one class per constant makes enums with
+    many constants faster to initialize.
+    """
+    base_eq = base_class.__eq__
+
     class Constant(base_class):
-        __slots__ = ()
+        __slots__ = ("kind", "_number", "_dj", "_rj", "_attribute", "_hash")
 
-        kind: Final[str] = spec.name
-        _number: Final[int] = spec.number
+        kind: str
+        _number: int
         # dense JSON
-        _dj: Final[int] = spec.number
+        _dj: int
         # readable JSON
-        _rj: Final[str] = spec.name
+        _rj: str
+        _attribute: str
+        _hash: int
         # has value
         _hv: Final[bool] = False
 
-        def __init__(self):
+        def __init__(self, spec: _spec.ConstantField):
             # Do not call super().__init__().
             object.__setattr__(self, "value", None)
+            object.__setattr__(self, "kind", spec.name)
+            object.__setattr__(self, "_number", spec.number)
+            object.__setattr__(self, "_dj", spec.number)
+            object.__setattr__(self, "_rj", spec.name)
+            object.__setattr__(self, "_attribute", spec.attribute)
+            # Same as the hash computed by BaseClass.__hash__(), precomputed.
+            object.__setattr__(self, "_hash", hash((record_hash, spec.name, None)))
 
         def __repr__(self) -> str:
-            return f"{base_class.__qualname__}.{spec.attribute}"
+            return f"{base_class.__qualname__}.{self._attribute}"
+
+        def __hash__(self) -> int:
+            return self._hash
+
+        def __eq__(self, other: Any) -> bool:
+            # A constant is a singleton, equal only to itself. UNKNOWN is the
+            # exception: it is also equal to every unrecognized enum, so it uses the
+            # base class implementation.
+            if self is other:
+                return True
+            if self._number == 0:
+                return base_eq(self, other)
+            if isinstance(other, base_class):
+                return False
+            return NotImplemented
 
     return Constant
 
@@ -210,6 +244,7 @@ def _make_value_class(
     base_class: type,
     field_spec: _spec.ValueField,
     field_type: TypeAdapter,
+    record_hash: int,
 ) -> type:
     number = field_spec.number
 
@@ -220,6 +255,8 @@ def _make_value_class(
         _number: Final[int] = number
         # has value
         _hv: Final[bool] = True
+        # Hash of the part which is the same for all the instances of the class.
+        _kind_hash: Final[int] = hash((record_hash, field_spec.name))
 
         def __init__(self):
             # Do not call super().__init__().
@@ -233,56 +270,90 @@ def _make_value_class(
                 body = value_repr.repr
             return f"{base_class.__qualname__}.wrap_{field_spec.name}({body})"
 
+        def __hash__(self) -> int:
+            return hash((self._kind_hash, self.value))
+
     ret = Value
+    ret._dj = property(_get_to_dense_json_fn(field_type, number))
+    ret._rj = property(_get_to_readable_json_fn(field_type, field_spec.name))
 
-    ret._dj = property(
-        make_function(
+    return ret
+
+
+def _get_to_dense_json_fn(field_type: TypeAdapter, number: int) -> Callable:
+    # Value classes must subclass the base class of their enum, so they can't be
+    # shared between enums, but the functions which convert them to JSON can.
+    key = (field_type, number)
+    ret = _to_dense_json_fn_cache.get(key)
+    if ret is None:
+        ret = make_function(
             name="to_dense_json",
             params=["self"],
             body=[
                 Line.join(
-                    f"return [{field_spec.number}, ",
+                    f"return [{number}, ",
                     field_type.to_json_expr("self.value", readable=False),
                     "]",
                 ),
             ],
+            locals_as_defaults=True,
         )
-    )
+        _to_dense_json_fn_cache[key] = ret
+    return ret
 
-    ret._rj = property(
-        make_function(
+
+def _get_to_readable_json_fn(field_type: TypeAdapter, name: str) -> Callable:
+    key = (field_type, name)
+    ret = _to_readable_json_fn_cache.get(key)
+    if ret is None:
+        ret = make_function(
             name="to_readable_json",
             params=["self"],
             body=[
                 Line.join(
                     "return {",
-                    f'"kind": "{field_spec.name}", "value": ',
+                    f'"kind": "{name}", "value": ',
                     field_type.to_json_expr("self.value", readable=True),
                     "}",
                 ),
             ],
+            locals_as_defaults=True,
         )
-    )
-
+        _to_readable_json_fn_cache[key] = ret
     return ret
 
 
+_to_dense_json_fn_cache: dict[tuple[TypeAdapter, int], Callable] = {}
+_to_readable_json_fn_cache: dict[tuple[TypeAdapter, str], Callable] = {}
+
+
 @dataclass(frozen=True)
 class _ValueField:
     spec: _spec.ValueField
     field_type: TypeAdapter
     value_class: type
+    # The __set__() method of the descriptor of the 'value' slot. Calling it directly
+    # is faster than calling object.__setattr__(), which looks up the attribute by
+    # name.
+    set_value_fn: Callable[[Any, Any], None]
 
 
 def _make_value_field(
-    spec: _spec.ValueField, field_type: TypeAdapter, base_class: type
+    spec: _spec.ValueField,
+    field_type: TypeAdapter,
+    base_class: type,
+    record_hash: int,
 ) -> _ValueField:
     return _ValueField(
         spec=spec,
         field_type=field_type,
         value_class=_make_value_class(
-            base_class=base_class, field_spec=spec, field_type=field_type
+            base_class=base_class,
+            field_spec=spec,
+            field_type=field_type,
+            record_hash=record_hash,
         ),
+        set_value_fn=base_class.value.__set__,
     )
 
 
@@ -290,8 +361,8 @@ def _make_wrap_fn(field: _ValueField) -> Callable[[Any], Any]:
     builder = BodyBuilder()
     builder.append_ln("ret = ", Expr.local("value_class", field.value_class), "()")
     builder.append_ln(
-        Expr.local("setattr", object.__setattr__),
-        "(ret, 'value', ",
+        Expr.local("set_value", field.set_value_fn),
+        "(ret, ",
         field.field_type.to_frozen_expr("value"),
         ")",
     )
@@ -303,6 +374,28 @@ def _make_wrap_fn(field: _ValueField) -> Callable[[Any], Any]:
     )
 
 
+def _make_decode_value_fn(field: _ValueField) -> Callable[[Any], Any]:
+    """
+    Returns a function which decodes the JSON value of the given value field and wraps
+    it into an enum instance.
+    """
+    builder = BodyBuilder()
+    builder.append_ln("ret = ", Expr.local("value_class", field.value_class), "()")
+    builder.append_ln(
+        Expr.local("set_value", field.set_value_fn),
+        "(ret, ",
+        field.field_type.from_json_expr("json"),
+        ")",
+    )
+    builder.append_ln("return ret")
+    return make_function(
+        name=f"decode_{field.spec.name}",
+        params=["json"],
+        body=builder.build(),
+        locals_as_defaults=True,
+    )
+
+
 def _make_from_json_fn(
     constant_fields: Sequence[_spec.ConstantField],
     value_fields: Sequence[_ValueField],
@@ -311,143 +404,99 @@ def _make_from_json_fn(
 ) -> Callable[[Any], Any]:
     unrecognized_class = _make_unrecognized_class(base_class)
     unrecognized_class_local = Expr.local("Unrecognized", unrecognized_class)
-    obj_setattr_local = Expr.local("obj_settatr", object.__setattr__)
     removed_numbers_local = Expr.local("removed_numbers", removed_numbers)
+    # Bind the builtins used in the function body to locals of the function, to
+    # avoid global lookups.
+    isinstance_local = Expr.local("isinstance", isinstance)
+    int_local = Expr.local("int", int)
+    list_local = Expr.local("list", list)
+    str_local = Expr.local("str", str)
+    dict_local = Expr.local("dict", dict)
+    base_class_local = Expr.local("_cls", base_class)
 
     key_to_constant: dict[Union[int, str], Any] = {}
     for field in constant_fields:
         constant = getattr(base_class, field.attribute)
         key_to_constant[field.number] = constant
         key_to_constant[field.name] = constant
-    key_to_constant_local = Expr.local("key_to_constant", key_to_constant)
     unknown_constant = key_to_constant[0]
+    # A removed number decodes to UNKNOWN.
+    for number in removed_numbers:
+        key_to_constant.setdefault(number, unknown_constant)
+    key_to_constant_local = Expr.local("key_to_constant", key_to_constant)
     unknown_constant_local = Expr.local("unknown_constant", unknown_constant)
 
-    numbers: list[int] = []
-    names: list[str] = []
-    key_to_field: dict[Union[int, str], _ValueField] = {}
+    # Maps the number and the name of every value field to a function which decodes
+    # the JSON value of the field and wraps it. Dispatching with a dict lookup is
+    # O(1) in the number of value fields.
+    number_to_decode_fn: dict[int, Callable[[Any], Any]] = {}
+    name_to_decode_fn: dict[str, Callable[[Any], Any]] = {}
     for field in value_fields:
-        numbers.append(field.spec.number)
-        names.append(field.spec.name)
-        key_to_field[field.spec.number] = field
-        key_to_field[field.spec.name] = field
-    value_keys_local = Expr.local("value_keys", set(key_to_field.keys()))
+        decode_fn = _make_decode_value_fn(field)
+        number_to_decode_fn[field.spec.number] = decode_fn
+        name_to_decode_fn[field.spec.name] = decode_fn
+    number_to_decode_fn_local = Expr.local("number_to_decode_fn", number_to_decode_fn)
+    name_to_decode_fn_local = Expr.local("name_to_decode_fn", name_to_decode_fn)
 
     builder = BodyBuilder()
-    # The reason why we wrap the function inside a 'while' is explained below.
-    builder.append_ln("while True:")
-
     # DENSE FORMAT
-    if len(constant_fields) == 1:
-        builder.append_ln("  if json == 0:")
-        builder.append_ln("    return ", unknown_constant_local)
-    else:
-        # `json.__class__ is int` is significantly faster than `isinstance(json, int)`
-        builder.append_ln("  if json.__class__ is int:")
-        builder.append_ln("    try:")
-        builder.append_ln("      return ", key_to_constant_local, "[json]")
-        builder.append_ln("    except:")
-        if removed_numbers:
-            builder.append_ln("      if json in ", removed_numbers_local, ":")
-            builder.append_ln("        return ", unknown_constant_local)
-        builder.append_ln("      return ", unrecognized_class_local, "(json)")
-
-    def append_number_branches(numbers: list[int], indent: str) -> None:
-        if len(numbers) == 1:
-            number = numbers[0]
-            field = key_to_field[number]
-            value_class_local = Expr.local("cls?", field.value_class)
-            value_expr = field.field_type.from_json_expr("json[1]")
-            builder.append_ln(f"{indent}ret = ", value_class_local, "()")
-            builder.append_ln(
-                indent, obj_setattr_local, '(ret, "value", ', value_expr, ")"
-            )
-            builder.append_ln(f"{indent}return ret")
-        else:
-            indented = f"  {indent}"
-            mid_index = int(len(numbers) / 2)
-            mid_number = numbers[mid_index - 1]
-            operator = "==" if mid_index == 1 else "<="
-            builder.append_ln(f"{indent}if number {operator} {mid_number}:")
-            append_number_branches(numbers[0:mid_index], indented)
-            builder.append_ln(f"{indent}else:")
-            append_number_branches(numbers[mid_index:], indented)
+    # `json.__class__ is int` is significantly faster than `isinstance(json, int)`
+    builder.append_ln("if json.__class__ is ", int_local, ":")
+    builder.append_ln("  constant = ", key_to_constant_local, ".get(json)")
+    builder.append_ln("  if constant is not None:")
+    builder.append_ln("    return constant")
+    builder.append_ln("  return ", unrecognized_class_local, "(json)")
 
     # `json.__class__ is list` is significantly faster than `isinstance(json, list)`
-    builder.append_ln("  elif json.__class__ is list:")
-    builder.append_ln("    number = json[0]")
+    builder.append_ln("elif json.__class__ is ", list_local, ":")
+    builder.append_ln("  number = json[0]")
     if not value_fields:
         # The field was either removed or is an unrecognized field.
+        if removed_numbers:
+            builder.append_ln("  if number in ", removed_numbers_local, ":")
+            builder.append_ln("    return ", unknown_constant_local)
+        builder.append_ln("  return ", unrecognized_class_local, "(json)")
+    else:
+        builder.append_ln("  decode_fn = ", number_to_decode_fn_local, ".get(number)")
+        builder.append_ln("  if decode_fn is None:")
         if removed_numbers:
             builder.append_ln("    if number in ", removed_numbers_local, ":")
             builder.append_ln("      return ", unknown_constant_local)
         builder.append_ln("    return ", unrecognized_class_local, "(json)")
-    else:
-        if len(value_fields) == 1:
-            builder.append_ln(f"    if number != {value_fields[0].spec.number}:")
-        else:
-            builder.append_ln("    if number not in ", value_keys_local, ":")
-        if removed_numbers:
-            builder.append_ln("      if number in ", removed_numbers_local, ":")
-            builder.append_ln("        return ", unknown_constant_local)
-        builder.append_ln("      return ", unrecognized_class_local, "(json)")
-        append_number_branches(sorted(numbers), "    ")
+        builder.append_ln("  return decode_fn(json[1])")
 
     # READABLE FORMAT
-    if len(constant_fields) == 1:
-        builder.append_ln("  elif json == '?':")
-        builder.append_ln("    return ", unknown_constant_local)
-    else:
-        builder.append_ln("  if isinstance(json, str):")
-        builder.append_ln("    try:")
-        builder.append_ln("      return ", key_to_constant_local, "[json]")
-        builder.append_ln("    except:")
-        # In readable mode, drop unrecognized values and use UNKNOWN instead.
-        builder.append_ln("      return ", unknown_constant_local)
-
-    def append_name_branches(names: list[str], indent: str) -> None:
-        if len(names) == 1:
-            name = names[0]
-            field = key_to_field[name]
-            value_class_local = Expr.local("cls?", field.value_class)
-            value_expr = field.field_type.from_json_expr("json['value']")
-            builder.append_ln(f"{indent}ret = ", value_class_local, "()")
-            builder.append_ln(
-                indent, obj_setattr_local, '(ret, "value", ', value_expr, ")"
-            )
-            builder.append_ln(f"{indent}return ret")
-        else:
-            indented = f"  {indent}"
-            mid_index = int(len(names) / 2)
-            mid_name = names[mid_index - 1]
-            operator = "==" if mid_index == 1 else "<="
-            builder.append_ln(f"{indent}if kind {operator} '{mid_name}':")
-            append_name_branches(names[0:mid_index], indented)
-            builder.append_ln(f"{indent}else:")
-            append_name_branches(names[mid_index:], indented)
-
-    builder.append_ln("  elif isinstance(json, dict):")
+    builder.append_ln("elif ", isinstance_local, "(json, ", str_local, "):")
+    # In readable mode, drop unrecognized values and use UNKNOWN instead.
+    builder.append_ln(
+        "  return ", key_to_constant_local, ".get(json, ", unknown_constant_local, ")"
+    )
+
+    builder.append_ln("elif ", isinstance_local, "(json, ", dict_local, "):")
     if not value_fields:
-        builder.append_ln("    return ", unknown_constant_local)
+        builder.append_ln("  return ", unknown_constant_local)
     else:
-        builder.append_ln("    kind = json['kind']")
-        builder.append_ln("    if kind not in ", value_keys_local, ":")
-        builder.append_ln("      return ", unknown_constant_local)
-        builder.append_ln("    else:")
-        append_name_branches(sorted(names), "      ")
-
-    # In the unlikely event that json.loads() returns an instance of a subclass of int.
-    builder.append_ln("  elif isinstance(json, int):")
-    builder.append_ln("    json = int(json)")
-    builder.append_ln("  elif isinstance(json, list):")
-    builder.append_ln("    json = list(json)")
-    builder.append_ln("  else:")
-    builder.append_ln("    return TypeError()")
+        builder.append_ln(
+            "  decode_fn = ", name_to_decode_fn_local, ".get(json['kind'])"
+        )
+        builder.append_ln("  if decode_fn is None:")
+        builder.append_ln("    return ", unknown_constant_local)
+        builder.append_ln("  return decode_fn(json['value'])")
+
+    # In the unlikely event that json.loads() returns an instance of a subclass of int
+    # or list, convert it and dispatch again.
+    builder.append_ln("elif ", isinstance_local, "(json, ", int_local, "):")
+    builder.append_ln("  return ", base_class_local, "._fj(", int_local, "(json))")
+    builder.append_ln("elif ", isinstance_local, "(json, ", list_local, "):")
+    builder.append_ln("  return ", base_class_local, "._fj(", list_local, "(json))")
+    builder.append_ln("else:")
+    builder.append_ln("  return TypeError()")
 
     return make_function(
         name="from_json",
         params=["json"],
         body=builder.build(),
+        locals_as_defaults=True,
     )
 
 
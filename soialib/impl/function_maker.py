@@ -1,5 +1,6 @@
 import itertools
 from dataclasses import dataclass
+from types import CodeType
 from typing import Any, Callable, Iterable, Optional, Sequence, Union
 
 
@@ -7,7 +8,18 @@ def make_function(
     name: str,
     params: Sequence[Union[str, "Param"]],
     body: Sequence[Union[str, "Line"]],
+    locals_as_defaults: bool = False,
 ) -> Callable:
+    """Compiles a function with the given name, parameters and body.
+
+    By default, the locals referenced in the body are free variables of the function,
+    which Python loads with LOAD_DEREF. If `locals_as_defaults` is true, they are
+    instead bound as the default values of extra trailing positional parameters,
+    which Python loads with the faster LOAD_FAST. Unlike keyword-only defaults,
+    positional defaults add no per-call lookup. Only use it on hot functions which
+    are never called with more positional arguments than `params`, and whose
+    signature is not inspected by the user.
+    """
     params = [Param(p, default=None) if isinstance(p, str) else p for p in params]
 
     def make_locals() -> _Locals:
@@ -54,18 +66,35 @@ def make_function(
             return l
         return l._to_code(locals)
 
+    param_strs = [p._to_code(locals) for p in params]
+    if locals_as_defaults and locals.locals:
+        if any(p.name.startswith("*") for p in params):
+            raise ValueError(
+                f"Cannot bind locals as defaults of a function with varargs: {name}"
+            )
+        param_strs.extend(f"{n}={n}" for n in locals.locals.keys())
+
     body_str = "\n    ".join(line_to_code(l) for l in body) if body else "pass"
     text = f"""
 def __create_function__({', '.join(locals.locals.keys())}):
-  def {name}({', '.join(p._to_code(locals) for p in params)}):
+  def {name}({', '.join(param_strs)}):
     {body_str}
   return {name}
 """
+    # Many generated functions have the same text and only differ by the values of
+    # their locals, so only compile each text once.
+    code = _text_to_code.get(text)
+    if code is None:
+        code = compile(text, "<string>", "exec")
+        _text_to_code[text] = code
     ns = {}
-    exec(text, None, ns)
+    exec(code, None, ns)
     return ns["__create_function__"](**locals.locals)
 
 
+_text_to_code: dict[str, CodeType] = {}
+
+
 @dataclass(frozen=True)
 class LineSpan:
     "An immutable span within a line of Python code."
@@ -11,9 +11,17 @@ Other = TypeVar("Other")
 
 
 def get_optional_adapter(other_adapter: TypeAdapter) -> TypeAdapter:
-    return _other_adapter_to_optional_adapter.setdefault(
-        other_adapter, _OptionalAdapter(other_adapter)
-    )
+    if isinstance(other_adapter, _OptionalAdapter):
+        # An optional of an optional is the same as the inner optional: both use None
+        # to represent the absence of a value. Wrapping it again would only add
+        # redundant None checks to the generated code.
+        return other_adapter
+    optional_adapter = _other_adapter_to_optional_adapter.get(other_adapter)
+    if optional_adapter is not None:
+        return optional_adapter
+    optional_adapter = _OptionalAdapter(other_adapter)
+    _other_adapter_to_optional_adapter[other_adapter] = optional_adapter
+    return optional_adapter
 
 
 @dataclass(frozen=True)
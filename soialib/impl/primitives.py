@@ -52,9 +52,22 @@ class _AbstractIntAdapter(AbstractPrimitiveAdapter):
         return "0"
 
     def to_frozen_expr(self, arg_expr: ExprLike) -> Expr:
-        round_expr = Expr.local("round", round)
-        # Must accept float inputs and turn them into ints.
-        return Expr.join("(", arg_expr, " | 0)")
+        # Must accept float inputs and turn them into ints, the same way as
+        # from_json_expr. The class check makes the common case, where the input is
+        # already an int, as fast as a bitwise operation.
+        return Expr.join(
+            "(",
+            arg_expr,
+            " if ",
+            arg_expr,
+            ".__class__ is ",
+            Expr.local("_int", int),
+            " else ",
+            Expr.local("_round", round),
+            "(",
+            arg_expr,
+            "))",
+        )
 
     def is_not_default_expr(self, arg_expr: ExprLike, attr_expr: ExprLike) -> ExprLike:
         return arg_expr
@@ -69,7 +82,9 @@ class _AbstractIntAdapter(AbstractPrimitiveAdapter):
             json_expr,
             " if ",
             json_expr,
-            ".__class__ is (0).__class__ else ",
+            ".__class__ is ",
+            Expr.local("_int", int),
+            " else ",
             Expr.local("_round", round),
             "(",
             json_expr,
@@ -124,7 +139,7 @@ class _Float32Adapter(_AbstractFloatAdapter):
 
 @dataclass(frozen=True)
 class _Float64Adapter(_AbstractFloatAdapter):
-    """Type adapter implementation for float32."""
+    """Type adapter implementation for float64."""
 
 
 FLOAT32_ADAPTER: Final[TypeAdapter] = _Float32Adapter()
@@ -161,15 +176,28 @@ class _TimestampAdapter(AbstractPrimitiveAdapter):
             return Expr.join(in_expr, ".unix_millis")
 
     def from_json_expr(self, json_expr: ExprLike) -> Expr:
-        fn = Expr.local("_timestamp_from_json", _timestamp_from_json)
-        return Expr.join(fn, "(", json_expr, ")")
+        # Inline the common case, where the JSON is an int, to avoid a function call.
+        return Expr.join(
+            Expr.local("Timestamp", Timestamp),
+            "(unix_millis=(",
+            json_expr,
+            " if ",
+            json_expr,
+            ".__class__ is ",
+            Expr.local("_int", int),
+            " else ",
+            Expr.local("_unix_millis_from_json", _unix_millis_from_json),
+            "(",
+            json_expr,
+            ")))",
+        )
 
 
-def _timestamp_from_json(json: Any) -> Timestamp:
-    if json.__class__ is int or isinstance(json, int):
-        return Timestamp(unix_millis=json)
+def _unix_millis_from_json(json: Any) -> int:
+    if isinstance(json, int):
+        return json
     else:
-        return Timestamp(unix_millis=json["unix_millis"])
+        return json["unix_millis"]
 
 
 TIMESTAMP_ADAPTER: Final[TypeAdapter] = _TimestampAdapter()
@@ -189,7 +217,19 @@ class _StringAdapter(AbstractPrimitiveAdapter):
         return in_expr
 
     def from_json_expr(self, json_expr: ExprLike) -> Expr:
-        return Expr.join("('' + (", json_expr, " or ''))")
+        # The dense JSON of an empty string can be 0. The class check skips the
+        # truthiness check and the concatenation in the common case.
+        return Expr.join(
+            "(",
+            json_expr,
+            " if ",
+            json_expr,
+            ".__class__ is ",
+            Expr.local("_str", str),
+            " else '' + (",
+            json_expr,
+            " or ''))",
+        )
 
 
 STRING_ADAPTER: Final[TypeAdapter] = _StringAdapter()
@@ -202,7 +242,17 @@ class _BytesAdapter(AbstractPrimitiveAdapter):
         return 'b""'
 
     def to_frozen_expr(self, arg_expr: ExprLike) -> Expr:
-        return Expr.join("(b'' + ", arg_expr, ")")
+        return Expr.join(
+            "(",
+            arg_expr,
+            " if ",
+            arg_expr,
+            ".__class__ is ",
+            Expr.local("_bytes", bytes),
+            " else b'' + ",
+            arg_expr,
+            ")",
+        )
 
     def is_not_default_expr(self, arg_expr: ExprLike, attr_expr: ExprLike) -> ExprLike:
         return arg_expr
@@ -215,8 +265,23 @@ class _BytesAdapter(AbstractPrimitiveAdapter):
         return Expr.join(in_expr, ".hex()")
 
     def from_json_expr(self, json_expr: ExprLike) -> Expr:
+        # The dense JSON of an empty bytes can be 0. The class check skips the
+        # truthiness check in the common case.
+        fromhex_local = Expr.local("_fromhex", _BytesAdapter._fromhex_fn)
         return Expr.join(
-            Expr.local("fromhex", _BytesAdapter._fromhex_fn), "(", json_expr, ' or "")'
+            "(",
+            fromhex_local,
+            "(",
+            json_expr,
+            ") if ",
+            json_expr,
+            ".__class__ is ",
+            Expr.local("_str", str),
+            " else ",
+            fromhex_local,
+            "(",
+            json_expr,
+            ' or ""))',
         )
 
 
@@ -1,4 +1,6 @@
-from typing import Any, Union
+import threading
+from collections.abc import Callable
+from typing import Any, Final, Optional, Union
 
 from soialib import method, spec
 from soialib.impl import arrays, enums, optionals, primitives, structs
@@ -11,6 +13,24 @@ RecordAdapter = Union[structs.StructAdapter, enums.EnumAdapter]
 _record_id_to_adapter: dict[str, RecordAdapter] = {}
 
 
+_PRIMITIVE_TO_ADAPTER: dict[spec.PrimitiveType, TypeAdapter] = {
+    spec.PrimitiveType.BOOL: primitives.BOOL_ADAPTER,
+    spec.PrimitiveType.BYTES: primitives.BYTES_ADAPTER,
+    spec.PrimitiveType.FLOAT32: primitives.FLOAT32_ADAPTER,
+    spec.PrimitiveType.FLOAT64: primitives.FLOAT64_ADAPTER,
+    spec.PrimitiveType.INT32: primitives.INT32_ADAPTER,
+    spec.PrimitiveType.INT64: primitives.INT64_ADAPTER,
+    spec.PrimitiveType.STRING: primitives.STRING_ADAPTER,
+    spec.PrimitiveType.TIMESTAMP: primitives.TIMESTAMP_ADAPTER,
+    spec.PrimitiveType.UINT64: primitives.UINT64_ADAPTER,
+}
+
+
+# Guards the adapter registry, and the adapters of other modules which a module
+# finalizes, when modules are imported from different threads.
+_init_lock: Final = threading.Lock()
+
+
 def init_module(
     records: tuple[spec.Record, ...],
     methods: tuple[spec.Method, ...],
@@ -19,38 +39,53 @@ def init_module(
     # For testing
     record_id_to_adapter: dict[str, RecordAdapter] = _record_id_to_adapter,
 ) -> None:
-    def resolve_type(type: spec.Type) -> TypeAdapter:
-        if isinstance(type, spec.PrimitiveType):
-            if type == spec.PrimitiveType.BOOL:
-                return primitives.BOOL_ADAPTER
-            elif type == spec.PrimitiveType.BYTES:
-                return primitives.BYTES_ADAPTER
-            elif type == spec.PrimitiveType.FLOAT32:
-                return primitives.FLOAT32_ADAPTER
-            elif type == spec.PrimitiveType.FLOAT64:
-                return primitives.FLOAT64_ADAPTER
-            elif type == spec.PrimitiveType.INT32:
-                return primitives.INT32_ADAPTER
-            elif type == spec.PrimitiveType.INT64:
-                return primitives.INT64_ADAPTER
-            elif type == spec.PrimitiveType.STRING:
-                return primitives.STRING_ADAPTER
-            elif type == spec.PrimitiveType.TIMESTAMP:
-                return primitives.TIMESTAMP_ADAPTER
-            elif type == spec.PrimitiveType.UINT64:
-                return primitives.UINT64_ADAPTER
-        elif isinstance(type, spec.ArrayType):
-            return arrays.get_array_adapter(
+    with _init_lock:
+        _init_module(records, methods, constants, globals, record_id_to_adapter)
+
+
+def _init_module(
+    records: tuple[spec.Record, ...],
+    methods: tuple[spec.Method, ...],
+    constants: tuple[spec.Constant, ...],
+    globals: dict[str, Any],
+    record_id_to_adapter: dict[str, RecordAdapter],
+) -> None:
+    # Array and optional types are frozen dataclasses, so structurally equal types
+    # found in different fields of the module share the same cache entry.
+    resolved_types: dict[Union[spec.ArrayType, spec.OptionalType], TypeAdapter] = {}
+
+    def resolve_array_type(type: spec.ArrayType) -> TypeAdapter:
+        ret = resolved_types.get(type)
+        if ret is None:
+            ret = arrays.get_array_adapter(
                 resolve_type(type.item),
                 type.key_attributes,
             )
-        elif isinstance(type, spec.OptionalType):
-            return optionals.get_optional_adapter(resolve_type(type.other))
-        elif isinstance(type, str):
-            # A record id.
-            return record_id_to_adapter[type]
+            resolved_types[type] = ret
+        return ret
+
+    def resolve_optional_type(type: spec.OptionalType) -> TypeAdapter:
+        ret = resolved_types.get(type)
+        if ret is None:
+            ret = optionals.get_optional_adapter(resolve_type(type.other))
+            resolved_types[type] = ret
+        return ret
+
+    # Dispatch on the class of the type with a dict lookup rather than a chain of
+    # isinstance() checks. A str is a record id.
+    type_class_to_resolve_fn: dict[type, Callable[[Any], TypeAdapter]] = {
+        spec.PrimitiveType: _PRIMITIVE_TO_ADAPTER.__getitem__,
+        spec.ArrayType: resolve_array_type,
+        spec.OptionalType: resolve_optional_type,
+        str: record_id_to_adapter.__getitem__,
+    }
+
+    def resolve_type(type: spec.Type) -> TypeAdapter:
+        return type_class_to_resolve_fn[type.__class__](type)
 
-    module_adapters: list[RecordAdapter] = []
+    # Pairs an adapter with the record id of its parent, or None if the record is
+    # defined at the top level.
+    module_adapters: list[tuple[RecordAdapter, Optional[str]]] = []
     for record in records:
         if record.id in record_id_to_adapter:
             raise AssertionError(record.id)
@@ -59,19 +94,18 @@ def init_module(
             adapter = structs.StructAdapter(record)
         else:
             adapter = enums.EnumAdapter(record)
-        module_adapters.append(adapter)
+        parent_id = spec.RecordId.parse(record.id).parent
+        module_adapters.append((adapter, parent_id and parent_id.record_id))
         record_id_to_adapter[record.id] = adapter
     # Once all the adapters of the module have been created, we can finalize them.
-    for adapter in module_adapters:
+    for adapter, parent_record_id in module_adapters:
         adapter.finalize(resolve_type)
         gen_class = adapter.gen_class
         # Add the class name to either globals() if the record is defined at the top
         # level, or the parent class otherwise.
-        record_id = spec.RecordId.parse(adapter.spec.id)
-        parent_id = record_id.parent
         class_name = adapter.spec.class_name
-        if parent_id:
-            parent_adapter = record_id_to_adapter[parent_id.record_id]
+        if parent_record_id:
+            parent_adapter = record_id_to_adapter[parent_record_id]
             setattr(parent_adapter.gen_class, class_name, gen_class)
             gen_class._parent_class = parent_adapter.gen_class
         else:
@@ -1,7 +1,7 @@
 import json as jsonlib
 from collections.abc import Callable
 from dataclasses import FrozenInstanceError
-from typing import Any, Generic, TypeVar, cast, final
+from typing import Any, Final, Generic, TypeVar, cast, final
 from weakref import WeakValueDictionary
 
 from soialib.impl.function_maker import Expr, LineSpan, make_function
@@ -16,46 +16,53 @@ class Serializer(Generic[T]):
     __slots__ = (
         "__weakref__",
         "_adapter",
-        "_to_dense_json_fn",
-        "_to_readable_json_fn",
-        "_from_json_fn",
+        "to_dense_json",
+        "to_readable_json",
+        "from_json",
     )
 
     _adapter: TypeAdapter
-    _to_dense_json_fn: Callable[[T], Any]
-    _to_readable_json_fn: Callable[[T], Any]
-    _from_json_fn: Callable[[Any], T]
+    # Same as to_json(input) and to_json(input, readable=True), without the keyword
+    # argument and the extra function call.
+    to_dense_json: Callable[[T], Any]
+    to_readable_json: Callable[[T], Any]
+    # The generated function, stored directly in a slot rather than wrapped in a
+    # method, to avoid an extra function call.
+    from_json: Callable[[Any], T]
 
     def __init__(self, adapter: Never):
         # Use Never (^) as a trick to make the constructor internal.
         object.__setattr__(self, "_adapter", adapter)
-        object.__setattr__(
-            self, "_to_dense_json_fn", _make_to_json_fn(adapter, readable=False)
-        )
-        object.__setattr__(
-            self,
-            "_to_readable_json_fn",
-            _make_to_json_fn(adapter, readable=True),
-        )
-        object.__setattr__(self, "_from_json_fn", _make_from_json_fn(adapter))
+        # The to_json functions are only created on first use: see __getattr__().
+        object.__setattr__(self, "from_json", _make_from_json_fn(adapter))
 
     def to_json(self, input: T, *, readable=False) -> Any:
         if readable:
-            return self._to_readable_json_fn(input)
+            return self.to_readable_json(input)
         else:
-            return self._to_dense_json_fn(input)
+            return self.to_dense_json(input)
 
     def to_json_code(self, input: T, readable=False) -> str:
         if readable:
-            return jsonlib.dumps(self._to_readable_json_fn(input), indent=2)
+            return _readable_json_encoder.encode(self.to_readable_json(input))
         else:
-            return jsonlib.dumps(self._to_dense_json_fn(input), separators=(",", ":"))
-
-    def from_json(self, json: Any) -> T:
-        return self._from_json_fn(json)
+            return _dense_json_encoder.encode(self.to_dense_json(input))
 
     def from_json_code(self, json_code: str) -> T:
-        return self._from_json_fn(jsonlib.loads(json_code))
+        return self.from_json(jsonlib.loads(json_code))
+
+    def __getattr__(self, name: str) -> Any:
+        # Only called if the slot has not been set yet. Most applications only use
+        # one JSON flavor, so we don't generate the function of the other flavor
+        # until it is needed.
+        if name == "to_dense_json":
+            fn = _make_to_json_fn(self._adapter, readable=False)
+        elif name == "to_readable_json":
+            fn = _make_to_json_fn(self._adapter, readable=True)
+        else:
+            raise AttributeError(name)
+        object.__setattr__(self, name, fn)
+        return fn
 
     def __setattr__(self, name: str, value: Any):
         raise FrozenInstanceError(self.__class__.__qualname__)
@@ -64,6 +71,12 @@ class Serializer(Generic[T]):
         raise FrozenInstanceError(self.__class__.__qualname__)
 
 
+# json.dumps() creates a new encoder on every call when it's given any option, so
+# create the encoders once.
+_dense_json_encoder: Final = jsonlib.JSONEncoder(separators=(",", ":"))
+_readable_json_encoder: Final = jsonlib.JSONEncoder(indent=2)
+
+
 # A cache to make sure we only create one Serializer for each TypeAdapter.
 _type_adapter_to_serializer: WeakValueDictionary[TypeAdapter, Serializer] = (
     WeakValueDictionary()
@@ -71,9 +84,13 @@ _type_adapter_to_serializer: WeakValueDictionary[TypeAdapter, Serializer] = (
 
 
 def make_serializer(adapter: TypeAdapter) -> Serializer:
-    return _type_adapter_to_serializer.setdefault(
-        adapter, Serializer(cast(Never, adapter))
-    )
+    # Only create the Serializer on a cache miss: it generates and compiles the
+    # from_json function.
+    serializer = _type_adapter_to_serializer.get(adapter)
+    if serializer is None:
+        serializer = Serializer(cast(Never, adapter))
+        _type_adapter_to_serializer[adapter] = serializer
+    return serializer
 
 
 def _make_to_json_fn(adapter: TypeAdapter, readable: bool) -> Callable[[Any], Any]:
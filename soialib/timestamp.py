@@ -10,11 +10,15 @@ class Timestamp:
     unix_millis: int
 
     def __init__(self, unix_millis: int, _formatted: str = ""):
-        object.__setattr__(
-            self,
-            "unix_millis",
-            round(min(max(unix_millis, -8640000000000000), 8640000000000000)),
-        )
+        # Clamp with a conditional chain rather than min() and max(): it's faster, and
+        # in the common case the input is an int within bounds and needs no rounding.
+        if unix_millis < -8640000000000000:
+            unix_millis = -8640000000000000
+        elif unix_millis > 8640000000000000:
+            unix_millis = 8640000000000000
+        elif unix_millis.__class__ is not int:
+            unix_millis = round(unix_millis)
+        object.__setattr__(self, "unix_millis", unix_millis)
 
     @staticmethod
     def from_unix_millis(unix_millis: int) -> "Timestamp":
@@ -0,0 +1,28 @@
+import inspect
+import unittest
+
+from soialib.impl.function_maker import Expr, Line, make_function
+
+
+class FunctionMakerTestCase(unittest.TestCase):
+    def test_locals_as_defaults(self):
+        fn = make_function(
+            name="add",
+            params=["a"],
+            body=[Line.join("return a + ", Expr.local("b", 2))],
+            locals_as_defaults=True,
+        )
+        self.assertEqual(fn(1), 3)
+        self.assertEqual(inspect.getfullargspec(fn).args, ["a", "b"])
+        self.assertEqual(fn.__defaults__, (2,))
+
+    def test_locals_as_defaults_rejects_varargs(self):
+        for params in (["a", "*args"], ["a", "**kwargs"]):
+            with self.subTest(params=params):
+                with self.assertRaisesRegex(ValueError, "varargs"):
+                    make_function(
+                        name="f",
+                        params=params,
+                        body=[Line.join("return ", Expr.local("b", 2))],
+                        locals_as_defaults=True,
+                    )
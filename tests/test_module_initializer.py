@@ -1,5 +1,9 @@
 import dataclasses
+import functools
+import sys
+import types
 import unittest
+from collections.abc import Mapping
 from typing import Any
 
 from soialib import spec
@@ -9,348 +13,437 @@ from soialib.module_initializer import init_module
 from soialib.timestamp import Timestamp
 
 
-class ModuleInitializerTestCase(unittest.TestCase):
-    def init_test_module(self) -> dict[str, Any]:
-        globals: dict[str, Any] = {}
-        init_module(
-            records=(
-                spec.Struct(
-                    id="my/module.soia:Point",
-                    fields=(
-                        spec.Field(
-                            name="x",
-                            number=0,
-                            type=spec.PrimitiveType.FLOAT32,
-                        ),
-                        spec.Field(
-                            name="y",
-                            number=2,
-                            type=spec.PrimitiveType.FLOAT32,
-                        ),
-                    ),
-                    removed_numbers=(1,),
-                ),
-                spec.Struct(
-                    id="my/module.soia:Segment",
-                    fields=(
-                        spec.Field(
-                            name="a",
-                            number=0,
-                            type="my/module.soia:Point",
-                            has_mutable_getter=True,
-                        ),
-                        spec.Field(
-                            name="bb",
-                            _attribute="b",
-                            number=1,
-                            type="my/module.soia:Point",
-                            has_mutable_getter=True,
-                        ),
-                        spec.Field(
-                            name="c",
-                            number=2,
-                            type=spec.OptionalType("my/module.soia:Point"),
-                            has_mutable_getter=True,
-                        ),
-                    ),
-                ),
-                spec.Struct(
-                    id="my/module.soia:Shape",
-                    fields=(
-                        spec.Field(
-                            name="points",
-                            number=0,
-                            type=spec.ArrayType("my/module.soia:Point"),
-                            has_mutable_getter=True,
-                        ),
-                    ),
-                ),
-                spec.Struct(
-                    id="my/module.soia:Primitives",
-                    fields=(
-                        spec.Field(
-                            name="bool",
-                            number=0,
-                            type=spec.PrimitiveType.BOOL,
-                        ),
-                        spec.Field(
-                            name="bytes",
-                            number=1,
-                            type=spec.PrimitiveType.BYTES,
-                        ),
-                        spec.Field(
-                            name="f32",
-                            number=2,
-                            type=spec.PrimitiveType.FLOAT32,
-                        ),
-                        spec.Field(
-                            name="f64",
-                            number=3,
-                            type=spec.PrimitiveType.FLOAT64,
-                        ),
-                        spec.Field(
-                            name="i32",
-                            number=4,
-                            type=spec.PrimitiveType.INT32,
-                        ),
-                        spec.Field(
-                            name="i64",
-                            number=5,
-                            type=spec.PrimitiveType.INT32,
-                        ),
-                        spec.Field(
-                            name="u64",
-                            number=6,
-                            type=spec.PrimitiveType.INT32,
-                        ),
-                        spec.Field(
-                            name="s",
-                            number=7,
-                            type=spec.PrimitiveType.STRING,
-                        ),
-                        spec.Field(
-                            name="t",
-                            number=8,
-                            type=spec.PrimitiveType.TIMESTAMP,
-                        ),
-                    ),
-                ),
-                spec.Struct(
-                    id="my/module.soia:After",
-                    fields=(
-                        spec.Field(
-                            name="points",
-                            number=0,
-                            type=spec.ArrayType("my/module.soia:Point"),
-                            has_mutable_getter=True,
-                        ),
-                    ),
-                ),
-                spec.Enum(
-                    id="my/module.soia:PrimaryColor",
-                    constant_fields=(
-                        spec.ConstantField(
-                            name="RED",
-                            number=10,
-                        ),
-                        spec.ConstantField(
-                            name="GREEN",
-                            number=20,
-                        ),
-                        spec.ConstantField(
-                            name="BLUE",
-                            number=30,
-                        ),
-                    ),
-                ),
-                spec.Enum(
-                    id="my/module.soia:Status",
-                    constant_fields=(
-                        spec.ConstantField(
-                            name="OK",
-                            number=1,
-                        ),
-                    ),
-                    value_fields=(
-                        spec.ValueField(
-                            name="error",
-                            number=2,
-                            type=spec.PrimitiveType.STRING,
-                        ),
-                    ),
-                    removed_numbers=(1, 4),
-                ),
-                spec.Enum(
-                    id="my/module.soia:JsonValue",
-                    constant_fields=(
-                        spec.ConstantField(
-                            name="NULL",
-                            number=1,
-                        ),
-                    ),
-                    value_fields=(
-                        spec.ValueField(
-                            name="bool",
-                            number=2,
-                            type=spec.PrimitiveType.BOOL,
-                        ),
-                        spec.ValueField(
-                            name="number",
-                            number=3,
-                            type=spec.PrimitiveType.FLOAT64,
-                        ),
-                        spec.ValueField(
-                            name="string",
-                            number=4,
-                            type=spec.PrimitiveType.STRING,
-                        ),
-                        spec.ValueField(
-                            name="array",
-                            number=5,
-                            type=spec.ArrayType("my/module.soia:JsonValue"),
-                        ),
-                        spec.ValueField(
-                            name="object",
-                            number=6,
-                            type="my/module.soia:JsonValue.Object",
-                        ),
-                    ),
-                    removed_numbers=(
-                        100,
-                        101,
-                    ),
-                ),
-                spec.Struct(
-                    id="my/module.soia:JsonValue.Object",
-                    fields=(
-                        spec.Field(
-                            name="entries",
-                            number=0,
-                            type=spec.ArrayType(
-                                item="my/module.soia:JsonValue.ObjectEntry",
-                                key_attributes=("name",),
-                            ),
-                        ),
-                    ),
-                ),
-                spec.Struct(
-                    id="my/module.soia:JsonValue.ObjectEntry",
-                    fields=(
-                        spec.Field(
-                            name="name",
-                            number=0,
-                            type=spec.PrimitiveType.STRING,
-                        ),
-                        spec.Field(
-                            name="value",
-                            number=1,
-                            type="my/module.soia:JsonValue",
-                        ),
-                    ),
-                ),
-                spec.Struct(
-                    id="my/module.soia:Parent",
-                    fields=(),
-                ),
-                spec.Enum(
-                    id="my/module.soia:Parent.NestedEnum",
-                ),
-                spec.Struct(
-                    id="my/module.soia:Stuff",
-                    fields=(
-                        spec.Field(
-                            name="enum_wrappers",
-                            number=0,
-                            type=spec.ArrayType(
-                                item="my/module.soia:EnumWrapper",
-                                key_attributes=(
-                                    "status",
-                                    "kind",
-                                ),
-                            ),
-                        ),
-                    ),
-                ),
-                spec.Struct(
-                    id="my/module.soia:EnumWrapper",
-                    fields=(
-                        spec.Field(
-                            name="status",
-                            number=0,
-                            type="my/module.soia:Status",
-                        ),
-                    ),
-                ),
-                spec.Struct(
-                    id="my/module.soia:Stuff.Overrides",
-                    _class_name="NameOverrides",
-                    _class_qualname="Stuff.NameOverrides",
-                    fields=(
-                        spec.Field(
-                            name="x",
-                            _attribute="y",
-                            number=0,
-                            type=spec.PrimitiveType.INT32,
-                        ),
-                    ),
-                ),
-                spec.Struct(
-                    id="my/module.soia:RecOuter",
-                    fields=(
-                        spec.Field(
-                            name="r",
-                            number=0,
-                            type="my/module.soia:RecOuter.RecInner",
-                        ),
-                    ),
-                ),
-                spec.Struct(
-                    id="my/module.soia:RecOuter.RecInner",
-                    fields=(
-                        spec.Field(
-                            name="r",
-                            number=0,
-                            type="my/module.soia:RecOuter",
-                        ),
-                    ),
-                ),
-                spec.Struct(
-                    id="my/module.soia:Foobar",
-                    fields=(
-                        spec.Field(
-                            name="a",
-                            number=1,
-                            type=spec.PrimitiveType.INT32,
-                        ),
-                        spec.Field(
-                            name="b",
-                            number=3,
-                            type=spec.PrimitiveType.INT32,
-                        ),
-                        spec.Field(
-                            name="point",
-                            number=4,
-                            type="my/module.soia:Point",
-                        ),
-                    ),
-                    removed_numbers=(0, 2),
-                ),
+@functools.cache
+def _field(name: str, number: int, type: spec.Type, **kwargs: Any) -> spec.Field:
+    # Cached so that equal fields of different records share the same spec.
+    return spec.Field(name=name, number=number, type=type, **kwargs)
+
+
+# Ids of the records referenced by other specs. Interned so that resolving them
+# compares equal strings by identity.
+_POINT = sys.intern("my/module.soia:Point")
+_SHAPE = sys.intern("my/module.soia:Shape")
+_JSON_VALUE = sys.intern("my/module.soia:JsonValue")
+_JSON_VALUE_OBJECT = sys.intern("my/module.soia:JsonValue.Object")
+_JSON_VALUE_OBJECT_ENTRY = sys.intern("my/module.soia:JsonValue.ObjectEntry")
+_ENUM_WRAPPER = sys.intern("my/module.soia:EnumWrapper")
+_STATUS = sys.intern("my/module.soia:Status")
+_REC_OUTER = sys.intern("my/module.soia:RecOuter")
+_REC_INNER = sys.intern("my/module.soia:RecOuter.RecInner")
+
+
+_RECORDS = (
+    spec.Struct(
+        id=_POINT,
+        fields=(
+            _field("x", 0, spec.PrimitiveType.FLOAT32),
+            _field("y", 2, spec.PrimitiveType.FLOAT32),
+        ),
+        removed_numbers=(1,),
+    ),
+    spec.Struct(
+        id="my/module.soia:Segment",
+        fields=(
+            _field("a", 0, _POINT, has_mutable_getter=True),
+            _field("bb", 1, _POINT, _attribute="b", has_mutable_getter=True),
+            _field("c", 2, spec.OptionalType(_POINT), has_mutable_getter=True),
+        ),
+    ),
+    spec.Struct(
+        id=_SHAPE,
+        fields=(
+            _field("points", 0, spec.ArrayType(_POINT), has_mutable_getter=True),
+        ),
+    ),
+    spec.Struct(
+        id="my/module.soia:Primitives",
+        fields=(
+            _field("bool", 0, spec.PrimitiveType.BOOL),
+            _field("bytes", 1, spec.PrimitiveType.BYTES),
+            _field("f32", 2, spec.PrimitiveType.FLOAT32),
+            _field("f64", 3, spec.PrimitiveType.FLOAT64),
+            _field("i32", 4, spec.PrimitiveType.INT32),
+            _field("i64", 5, spec.PrimitiveType.INT32),
+            _field("u64", 6, spec.PrimitiveType.INT32),
+            _field("s", 7, spec.PrimitiveType.STRING),
+            _field("t", 8, spec.PrimitiveType.TIMESTAMP),
+        ),
+    ),
+    spec.Struct(
+        id="my/module.soia:After",
+        fields=(
+            _field("points", 0, spec.ArrayType(_POINT), has_mutable_getter=True),
+        ),
+    ),
+    spec.Enum(
+        id="my/module.soia:PrimaryColor",
+        constant_fields=(
+            spec.ConstantField(
+                name="RED",
+                number=10,
             ),
-            methods=(
-                spec.Method(
-                    name="FirstMethod",
-                    number=-300,
-                    request_type="my/module.soia:Point",
-                    response_type="my/module.soia:Shape",
-                ),
-                spec.Method(
-                    name="SecondMethod",
-                    number=-301,
-                    request_type="my/module.soia:Point",
-                    response_type="my/module.soia:Shape",
-                    _var_name="MethodVar",
+            spec.ConstantField(
+                name="GREEN",
+                number=20,
+            ),
+            spec.ConstantField(
+                name="BLUE",
+                number=30,
+            ),
+        ),
+    ),
+    spec.Enum(
+        id=_STATUS,
+        constant_fields=(
+            spec.ConstantField(
+                name="OK",
+                number=1,
+            ),
+        ),
+        value_fields=(
+            spec.ValueField(
+                name="error",
+                number=2,
+                type=spec.PrimitiveType.STRING,
+            ),
+        ),
+        removed_numbers=(1, 4),
+    ),
+    spec.Enum(
+        id=_JSON_VALUE,
+        constant_fields=(
+            spec.ConstantField(
+                name="NULL",
+                number=1,
+            ),
+        ),
+        value_fields=(
+            spec.ValueField(
+                name="bool",
+                number=2,
+                type=spec.PrimitiveType.BOOL,
+            ),
+            spec.ValueField(
+                name="number",
+                number=3,
+                type=spec.PrimitiveType.FLOAT64,
+            ),
+            spec.ValueField(
+                name="string",
+                number=4,
+                type=spec.PrimitiveType.STRING,
+            ),
+            spec.ValueField(
+                name="array",
+                number=5,
+                type=spec.ArrayType(_JSON_VALUE),
+            ),
+            spec.ValueField(
+                name="object",
+                number=6,
+                type=_JSON_VALUE_OBJECT,
+            ),
+        ),
+        removed_numbers=(
+            100,
+            101,
+        ),
+    ),
+    spec.Struct(
+        id=_JSON_VALUE_OBJECT,
+        fields=(
+            _field(
+                "entries",
+                0,
+                spec.ArrayType(
+                    item=_JSON_VALUE_OBJECT_ENTRY,
+                    key_attributes=("name",),
                 ),
             ),
-            constants=(
-                spec.Constant(
-                    name="C",
-                    type="my/module.soia:Point",
-                    json_code="[1.5, 0, 2.5]",
+        ),
+    ),
+    spec.Struct(
+        id=_JSON_VALUE_OBJECT_ENTRY,
+        fields=(
+            _field("name", 0, spec.PrimitiveType.STRING),
+            _field("value", 1, _JSON_VALUE),
+        ),
+    ),
+    spec.Struct(
+        id="my/module.soia:Parent",
+        fields=(),
+    ),
+    spec.Enum(
+        id="my/module.soia:Parent.NestedEnum",
+    ),
+    spec.Struct(
+        id="my/module.soia:Stuff",
+        fields=(
+            _field(
+                "enum_wrappers",
+                0,
+                spec.ArrayType(
+                    item=_ENUM_WRAPPER,
+                    key_attributes=(
+                        "status",
+                        "kind",
+                    ),
                 ),
             ),
-            globals=globals,
-            record_id_to_adapter={},
-        )
-        return globals
+        ),
+    ),
+    spec.Struct(
+        id=_ENUM_WRAPPER,
+        fields=(
+            _field("status", 0, _STATUS),
+        ),
+    ),
+    spec.Struct(
+        id="my/module.soia:Stuff.Overrides",
+        _class_name="NameOverrides",
+        _class_qualname="Stuff.NameOverrides",
+        fields=(
+            _field("x", 0, spec.PrimitiveType.INT32, _attribute="y"),
+        ),
+    ),
+    spec.Struct(
+        id=_REC_OUTER,
+        fields=(
+            _field("r", 0, _REC_INNER),
+        ),
+    ),
+    spec.Struct(
+        id=_REC_INNER,
+        fields=(
+            _field("r", 0, _REC_OUTER),
+        ),
+    ),
+    spec.Struct(
+        id="my/module.soia:Foobar",
+        fields=(
+            _field("a", 1, spec.PrimitiveType.INT32),
+            _field("b", 3, spec.PrimitiveType.INT32),
+            _field("point", 4, _POINT),
+        ),
+        removed_numbers=(0, 2),
+    ),
+)
+
+_METHODS = (
+    spec.Method(
+        name="FirstMethod",
+        number=-300,
+        request_type=_POINT,
+        response_type=_SHAPE,
+    ),
+    spec.Method(
+        name="SecondMethod",
+        number=-301,
+        request_type=_POINT,
+        response_type=_SHAPE,
+        _var_name="MethodVar",
+    ),
+)
+
+_CONSTANTS = (
+    spec.Constant(
+        name="C",
+        type=_POINT,
+        json_code="[1.5, 0, 2.5]",
+    ),
+)
+
+
+# Dense JSON of a struct with every field set to its default value. A list rather
+# than a tuple, because from_json() dispatches on the JSON type.
+_ZEROS_100 = [0] * 100
+
+
+# Dense JSON of the Primitives struct used in the tests.
+_PRIMITIVES_DENSE_JSON = [1, "61", 3.14, 3.14, 1, 2, 3, "", 4]
+# Repr of the same Primitives struct.
+_EXPECTED_PRIMITIVES_REPR = (
+    "Primitives(\n"
+    "  bool=True,\n"
+    "  bytes=b'a',\n"
+    "  f32=3.14,\n"
+    "  f64=3.14,\n"
+    "  i32=1,\n"
+    "  i64=2,\n"
+    "  u64=3,\n"
+    "  t=Timestamp(\n"
+    "    unix_millis=4,\n"
+    "    _formatted='1970-01-01T00:00:00.004000Z',\n"
+    "  ),\n"
+    ")"
+)
+
+# Dense and readable JSON of the same JsonValue.
+_COMPLEX_ENUM_JSON = [
+    5,
+    [
+        0,
+        1,
+        [2, True],
+        [3, 3.14],
+        [4, "foo"],
+        [
+            6,
+            [["a", 0], ["b", 0]],
+        ],
+        [5, [[5, []]]],
+    ],
+]
+_COMPLEX_ENUM_READABLE_JSON = {
+    "kind": "array",
+    "value": [
+        "?",
+        "NULL",
+        {"kind": "bool", "value": True},
+        {"kind": "number", "value": 3.14},
+        {"kind": "string", "value": "foo"},
+        {"kind": "object", "value": {"entries": [{}, {}]}},
+        {"kind": "array", "value": [{"kind": "array", "value": []}]},
+    ],
+}
+
+
+# Expected multiline reprs.
+_POINT_MUTABLE_REPR = (
+    "Point.Mutable(\n"
+    "  x=1.5,\n"
+    "  y=0.0,\n"
+    ")"
+)
+_POINT_REPR = (
+    "Point(\n"
+    "  x=1.5,\n"
+    "  y=2.5,\n"
+    ")"
+)
+_DEFAULT_POINT_MUTABLE_REPR = (
+    "Point.Mutable(\n"
+    "  x=0.0,\n"
+    "  y=0.0,\n"
+    ")"
+)
+_SHAPE_WITH_ONE_POINT_REPR = (
+    "Shape(\n"
+    "  points=[\n"
+    "    Point(x=1.5),\n"
+    "  ],\n"
+    ")"
+)
+_SHAPE_WITH_TWO_POINTS_REPR = (
+    "Shape(\n"
+    "  points=[\n"
+    "    Point(x=1.5),\n"
+    "    Point(y=2.5),\n"
+    "  ],\n"
+    ")"
+)
+_SHAPE_MUTABLE_REPR = (
+    "Shape.Mutable(\n"
+    "  points=[\n"
+    "    Point(x=1.5),\n"
+    "    Point.Mutable(\n"
+    "      x=0.0,\n"
+    "      y=2.5,\n"
+    "    ),\n"
+    "  ],\n"
+    ")"
+)
+_MULTILINE_ERROR_REPR = (
+    "Status.wrap_error(\n"
+    "  '\\n'.join([\n"
+    "    'multiple',\n"
+    "    'lines',\n"
+    "    '',\n"
+    "  ])\n"
+    ")"
+)
+_WRAPPED_OBJECT_REPR = (
+    "JsonValue.wrap_object(\n"
+    "  JsonValue.Object()\n"
+    ")"
+)
+
+
+# init_module() is deterministic, so the test module is built once and shared by all
+# the tests. The mapping is read-only so that a test can't change what the tests
+# which run after it see.
+@functools.cache
+def _get_test_module() -> Mapping[str, Any]:
+    globals: dict[str, Any] = {}
+    init_module(
+        records=_RECORDS,
+        methods=_METHODS,
+        constants=_CONSTANTS,
+        globals=globals,
+        record_id_to_adapter={},
+    )
+    return types.MappingProxyType(globals)
+
+
+class ModuleInitializerTestCase(unittest.TestCase):
+    # The classes used by the tests.
+    Point: Any
+    Segment: Any
+    Shape: Any
+    JsonValue: Any
+    Primitives: Any
+    Status: Any
+    Foobar: Any
+    PrimaryColor: Any
+    Parent: Any
+    Stuff: Any
+    EnumWrapper: Any
+    # The methods and constants.
+    FirstMethod: Any
+    MethodVar: Any
+    C: Any
+    # The serializers used by most tests.
+    PointSerializer: Any
+    ShapeSerializer: Any
+    JsonValueSerializer: Any
+    PrimitivesSerializer: Any
+    StatusSerializer: Any
+    FoobarSerializer: Any
+    PrimaryColorSerializer: Any
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        module = _get_test_module()
+        cls.Point = module["Point"]
+        cls.Segment = module["Segment"]
+        cls.Shape = module["Shape"]
+        cls.JsonValue = module["JsonValue"]
+        cls.Primitives = module["Primitives"]
+        cls.Status = module["Status"]
+        cls.Foobar = module["Foobar"]
+        cls.PrimaryColor = module["PrimaryColor"]
+        cls.Parent = module["Parent"]
+        cls.Stuff = module["Stuff"]
+        cls.EnumWrapper = module["EnumWrapper"]
+        cls.FirstMethod = module["FirstMethod"]
+        cls.MethodVar = module["MethodVar"]
+        cls.C = module["C"]
+        cls.PointSerializer = cls.Point.SERIALIZER
+        cls.ShapeSerializer = cls.Shape.SERIALIZER
+        cls.JsonValueSerializer = cls.JsonValue.SERIALIZER
+        cls.PrimitivesSerializer = cls.Primitives.SERIALIZER
+        cls.StatusSerializer = cls.Status.SERIALIZER
+        cls.FoobarSerializer = cls.Foobar.SERIALIZER
+        cls.PrimaryColorSerializer = cls.PrimaryColor.SERIALIZER
 
     def test_struct_getters(self):
-        point_cls = self.init_test_module()["Point"]
+        point_cls = self.Point
         point = point_cls(x=1.5, y=2.5)
         self.assertEqual(point.x, 1.5)
         self.assertEqual(point.y, 2.5)
 
     def test_to_mutable(self):
-        point_cls = self.init_test_module()["Point"]
+        point_cls = self.Point
         point = point_cls(x=1.5, y=2.5)
         mutable = point.to_mutable()
         mutable.x = 4.0
@@ -360,7 +453,7 @@ class ModuleInitializerTestCase(unittest.TestCase):
         self.assertIs(point.to_frozen(), point)
 
     def test_struct_eq(self):
-        point_cls = self.init_test_module()["Point"]
+        point_cls = self.Point
         a = point_cls(x=1.5, y=2.5)
         b = point_cls(x=1.5, y=2.5)
         c = point_cls(x=1.5, y=3.0)
@@ -371,11 +464,11 @@ class ModuleInitializerTestCase(unittest.TestCase):
         self.assertEqual(point_cls(), point_cls(x=0.0, y=0.0))
 
     def test_or_mutable(self):
-        point_cls = self.init_test_module()["Point"]
+        point_cls = self.Point
         point_cls.OrMutable
 
     def test_primitives_default_values(self):
-        primitives_cls = self.init_test_module()["Primitives"]
+        primitives_cls = self.Primitives
         a = primitives_cls(
             bool=False,
             bytes=b"",
@@ -390,43 +483,33 @@ class ModuleInitializerTestCase(unittest.TestCase):
         self.assertEqual(a, b)
         self.assertEqual(hash(a), hash(b))
 
-    def test_primitives_to_json(self):
-        primitives_cls = self.init_test_module()["Primitives"]
-        serializer = primitives_cls.SERIALIZER
-        p = primitives_cls(
-            bool=True,
-            bytes=b"a",
-            f32=3.14,
-            f64=3.14,
-            i32=1,
-            i64=2,
-            u64=3,
-            t=Timestamp.from_unix_millis(4),
-        )
-        self.assertEqual(serializer.to_json(p), [1, "61", 3.14, 3.14, 1, 2, 3, "", 4])
+    def test_struct_ctor_converts_floats_to_ints(self):
+        primitives_cls = self.Primitives
+        p = primitives_cls(i32=1.0, i64=2.0)
+        self.assertEqual(p.i32, 1)
+        self.assertIsInstance(p.i32, int)
+        self.assertEqual(p, primitives_cls(i32=1, i64=2))
+        # Rounds like from_json() does.
+        self.assertEqual(primitives_cls(i32=1.7).i32, 2)
+        from_json = self.PrimitivesSerializer.from_json
+        self.assertEqual(from_json([0, 0, 0, 0, 1.7]).i32, 2)
 
-    def test_primitives_from_json(self):
-        primitives_cls = self.init_test_module()["Primitives"]
-        serializer = primitives_cls.SERIALIZER
-        json = [0] * 100
-        self.assertEqual(serializer.from_json(json), primitives_cls.DEFAULT)
-        self.assertEqual(
-            serializer.from_json([1, "61", 3.14, 3.14, 1, 2, 3, "", 4]),
-            primitives_cls(
-                bool=True,
-                bytes=b"a",
-                f32=3.14,
-                f64=3.14,
-                i32=1,
-                i64=2,
-                u64=3,
-                t=Timestamp.from_unix_millis(4),
-            ),
-        )
+    def test_struct_ctor_rejects_strings_for_ints(self):
+        with self.assertRaises(TypeError):
+            self.Primitives(i32="12")
+
+    def test_struct_ctor_converts_ints_to_floats(self):
+        p = self.Primitives(f64=2)
+        self.assertEqual(p.f64, 2.0)
+        self.assertIsInstance(p.f64, float)
 
-    def test_primitives_repr(self):
-        primitives_cls = self.init_test_module()["Primitives"]
-        serializer = primitives_cls.SERIALIZER
+    def test_struct_ctor_checks_type_of_bytes(self):
+        with self.assertRaises(TypeError):
+            self.Primitives(bytes="a")
+
+    def test_primitives_roundtrip(self):
+        primitives_cls = self.Primitives
+        serializer = self.PrimitivesSerializer
         p = primitives_cls(
             bool=True,
             bytes=b"a",
@@ -437,14 +520,23 @@ class ModuleInitializerTestCase(unittest.TestCase):
             u64=3,
             t=Timestamp.from_unix_millis(4),
         )
-        self.assertEqual(
-            str(p),
-            "Primitives(\n  bool=True,\n  bytes=b'a',\n  f32=3.14,\n  f64=3.14,\n  i32=1,\n  i64=2,\n  u64=3,\n  t=Timestamp(\n    unix_millis=4,\n    _formatted='1970-01-01T00:00:00.004000Z',\n  ),\n)",
-        )
+        json = _PRIMITIVES_DENSE_JSON
+        cases = [
+            ("to_json", serializer.to_json(p), json),
+            ("from_json", serializer.from_json(json), p),
+            (
+                "from_json_defaults",
+                serializer.from_json(_ZEROS_100),
+                primitives_cls.DEFAULT,
+            ),
+            ("repr", str(p), _EXPECTED_PRIMITIVES_REPR),
+        ]
+        for label, got, want in cases:
+            with self.subTest(label):
+                self.assertEqual(got, want)
 
     def test_from_json_converts_between_ints_and_floats(self):
-        primitives_cls = self.init_test_module()["Primitives"]
-        serializer = primitives_cls.SERIALIZER
+        serializer = self.PrimitivesSerializer
         p = serializer.from_json([0, 0, 3])
         self.assertEqual(p.f32, 3.0)
         self.assertIsInstance(p.f32, float)
@@ -453,8 +545,7 @@ class ModuleInitializerTestCase(unittest.TestCase):
         self.assertIsInstance(p.i32, int)
 
     def test_cannot_mutate_frozen_class(self):
-        point_cls = self.init_test_module()["Point"]
-        serializer = point_cls.SERIALIZER
+        point_cls = self.Point
         point = point_cls(x=1.5, y=2.5)
         try:
             point.x = 3.5
@@ -464,57 +555,59 @@ class ModuleInitializerTestCase(unittest.TestCase):
         self.assertEqual(point.x, 1.5)
 
     def test_point_to_dense_json(self):
-        point_cls = self.init_test_module()["Point"]
-        serializer = point_cls.SERIALIZER
+        point_cls = self.Point
+        serializer = self.PointSerializer
         point = point_cls(x=1.5, y=2.5)
-        self.assertEqual(serializer.to_json(point), [1.5, 0, 2.5])
-        self.assertEqual(serializer.to_json(point, readable=False), [1.5, 0, 2.5])
+        self.assertListEqual(serializer.to_json(point), [1.5, 0, 2.5])
+        self.assertListEqual(serializer.to_json(point, readable=False), [1.5, 0, 2.5])
         self.assertEqual(serializer.to_json_code(point), "[1.5,0,2.5]")
         point = point_cls(x=1.5, y=0.0)
-        self.assertEqual(serializer.to_json(point), [1.5])
+        self.assertListEqual(serializer.to_json(point), [1.5])
 
     def test_point_to_readable_json(self):
-        point_cls = self.init_test_module()["Point"]
+        point_cls = self.Point
         point = point_cls(x=1.5, y=2.5)
-        json = point_cls.SERIALIZER.to_json(point, readable=True)
-        self.assertEqual(json, {"x": 1.5, "y": 2.5})
-        json_code = point_cls.SERIALIZER.to_json_code(point, readable=True)
+        json = self.PointSerializer.to_json(point, readable=True)
+        self.assertDictEqual(json, {"x": 1.5, "y": 2.5})
+        json_code = self.PointSerializer.to_json_code(point, readable=True)
         self.assertEqual(json_code, '{\n  "x": 1.5,\n  "y": 2.5\n}')
 
     def test_point_from_dense_json(self):
-        point_cls = self.init_test_module()["Point"]
-        serializer = point_cls.SERIALIZER
+        point_cls = self.Point
+        serializer = self.PointSerializer
         self.assertEqual(serializer.from_json([1.5, 0, 2.5]), point_cls(x=1.5, y=2.5))
         self.assertEqual(serializer.from_json([1.5]), point_cls(x=1.5))
         self.assertEqual(serializer.from_json([0.0]), point_cls.DEFAULT)
         self.assertEqual(serializer.from_json(0), point_cls.DEFAULT)
 
     def test_point_from_readable_json(self):
-        point_cls = self.init_test_module()["Point"]
-        point = point_cls.SERIALIZER.from_json({"x": 1.5, "y": 2.5})
+        point_cls = self.Point
+        point = self.PointSerializer.from_json({"x": 1.5, "y": 2.5})
         self.assertEqual(point, point_cls(x=1.5, y=2.5))
-        point = point_cls.SERIALIZER.from_json_code('{"x":1.5,"y":2.5}')
+        point = self.PointSerializer.from_json_code('{"x":1.5,"y":2.5}')
         self.assertEqual(point, point_cls(x=1.5, y=2.5))
-        point = point_cls.SERIALIZER.from_json_code('{"x":1.5,"y":2.5,"z":[]}')
+        point = self.PointSerializer.from_json_code('{"x":1.5,"y":2.5,"z":[]}')
         self.assertEqual(point, point_cls(x=1.5, y=2.5))
-        point = point_cls.SERIALIZER.from_json_code('{"x":1,"y":2}')
+        point = self.PointSerializer.from_json_code('{"x":1,"y":2}')
         self.assertEqual(point.x, 1.0)
         self.assertIsInstance(point.x, float)
 
-    def test_point_with_unrecognized_and_removed_fields(self):
-        point_cls = self.init_test_module()["Point"]
-        serializer = point_cls.SERIALIZER
+    def test_point_preserves_unrecognized_fields_on_roundtrip(self):
+        point_cls = self.Point
+        serializer = self.PointSerializer
         point = serializer.from_json([1.5, 1, 2.5, True])
         self.assertEqual(point, point_cls(x=1.5, y=2.5))
-        self.assertEqual(serializer.to_json(point), [1.5, 0, 2.5, True])
-        point = point.to_mutable().to_frozen()
-        self.assertEqual(serializer.to_json(point), [1.5, 0, 2.5, True])
+        self.assertListEqual(serializer.to_json(point), [1.5, 0, 2.5, True])
+
+    def test_mutable_frozen_preserves_unrecognized_fields(self):
+        serializer = self.PointSerializer
+        point = serializer.from_json([1.5, 1, 2.5, True]).to_mutable().to_frozen()
+        self.assertListEqual(serializer.to_json(point), [1.5, 0, 2.5, True])
 
     def test_struct_to_dense_json_with_removed_fields(self):
-        test_module = self.init_test_module()
-        foobar_cls = test_module["Foobar"]
-        point_cls = test_module["Point"]
-        serializer = foobar_cls.SERIALIZER
+        foobar_cls = self.Foobar
+        point_cls = self.Point
+        serializer = self.FoobarSerializer
         foobar = foobar_cls()
         self.assertEqual(serializer.to_json_code(foobar), "[]")
         self.assertEqual(serializer.from_json_code("[]"), foobar)
@@ -531,9 +624,8 @@ class ModuleInitializerTestCase(unittest.TestCase):
         self.assertEqual(serializer.from_json_code("[0,0,0,0,[2.0]]"), foobar)
 
     def test_struct_ctor_accepts_mutable_struct(self):
-        module = self.init_test_module()
-        segment_cls = module["Segment"]
-        point_cls = module["Point"]
+        segment_cls = self.Segment
+        point_cls = self.Point
         segment = segment_cls(
             a=point_cls(x=1.0, y=2.0).to_mutable(),
             b=point_cls(x=3.0, y=4.0),
@@ -548,36 +640,28 @@ class ModuleInitializerTestCase(unittest.TestCase):
         )
 
     def test_struct_ctor_checks_type_of_struct_param(self):
-        module = self.init_test_module()
-        segment_cls = module["Segment"]
-        try:
+        segment_cls = self.Segment
+        with self.assertRaisesRegex(Exception, "Point"):
             segment_cls(
                 # Should be a Point
                 a=segment_cls.DEFAULT,
             )
-            self.fail("Expected to fail")
-        except Exception as e:
-            self.assertIn("Point", str(e))
 
     def test_struct_ctor_raises_error_if_unknown_arg(self):
-        module = self.init_test_module()
-        segment_cls = module["Segment"]
+        segment_cls = self.Segment
+        with self.assertRaises(TypeError):
+            segment_cls(d=self.Point.DEFAULT)
 
     def test_to_frozen_checks_type_of_struct_field(self):
-        module = self.init_test_module()
-        segment_cls = module["Segment"]
+        segment_cls = self.Segment
         mutable = segment_cls.Mutable()
         mutable.a = segment_cls.DEFAULT  # Should be a Point
-        try:
+        with self.assertRaisesRegex(Exception, "Point"):
             mutable.to_frozen()
-            self.fail("Expected to fail")
-        except Exception as e:
-            self.assertIn("Point", str(e))
 
     def test_struct_ctor_accepts_mutable_list(self):
-        module = self.init_test_module()
-        shape_cls = module["Shape"]
-        point_cls = module["Point"]
+        shape_cls = self.Shape
+        point_cls = self.Point
         shape = shape_cls(
             points=[
                 point_cls(x=1.0, y=2.0).to_mutable(),
@@ -595,9 +679,8 @@ class ModuleInitializerTestCase(unittest.TestCase):
         )
 
     def test_listuple_not_copied(self):
-        module = self.init_test_module()
-        shape_cls = module["Shape"]
-        point_cls = module["Point"]
+        shape_cls = self.Shape
+        point_cls = self.Point
         shape = shape_cls(
             points=[
                 point_cls(x=1.0, y=2.0),
@@ -610,19 +693,28 @@ class ModuleInitializerTestCase(unittest.TestCase):
         self.assertIsNot(other_shape.points.__class__, tuple)
 
     def test_single_empty_listuple_instance(self):
-        module = self.init_test_module()
-        shape_cls = module["Shape"]
+        shape_cls = self.Shape
         shape = shape_cls(
             points=[],
         )
         self.assertIs(shape.points, shape_cls(points=[]).points)
         self.assertIs(shape.points, shape.to_mutable().to_frozen().points)
         self.assertIsNot(shape.points, ())
+        self.assertIs(shape.points, self.ShapeSerializer.from_json([[]]).points)
+        self.assertIs(
+            shape.points, self.ShapeSerializer.from_json({"points": []}).points
+        )
+
+    def test_array_from_json_rejects_non_arrays(self):
+        serializer = self.ShapeSerializer
+        for json in ([0], [None], {"points": None}):
+            with self.subTest(json=json):
+                with self.assertRaises(TypeError):
+                    serializer.from_json(json)
 
     def test_optional(self):
-        module = self.init_test_module()
-        segment_cls = module["Segment"]
-        point_cls = module["Point"]
+        segment_cls = self.Segment
+        point_cls = self.Point
         segment = segment_cls(
             c=point_cls.Mutable(x=1.0, y=2.0),
         )
@@ -635,44 +727,40 @@ class ModuleInitializerTestCase(unittest.TestCase):
         )
 
     def test_enum_unknown_constant(self):
-        module = self.init_test_module()
-        primary_color_cls = module["PrimaryColor"]
+        primary_color_cls = self.PrimaryColor
         unknown = primary_color_cls.UNKNOWN
         self.assertEqual(unknown.kind, "?")
-        self.assertEqual(unknown.value, None)
+        self.assertIsNone(unknown.value)
         self.assertIs(unknown.union, unknown)
-        serializer = primary_color_cls.SERIALIZER
+        serializer = self.PrimaryColorSerializer
         self.assertEqual(serializer.to_json(unknown), 0)
         self.assertEqual(serializer.to_json(unknown, readable=True), "?")
 
     def test_enum_user_defined_constant(self):
-        module = self.init_test_module()
-        primary_color_cls = module["PrimaryColor"]
+        primary_color_cls = self.PrimaryColor
         red = primary_color_cls.RED
         self.assertEqual(red.kind, "RED")
-        self.assertEqual(red.value, None)
+        self.assertIsNone(red.value)
         self.assertIs(red.union, red)
-        serializer = primary_color_cls.SERIALIZER
+        serializer = self.PrimaryColorSerializer
         self.assertEqual(serializer.to_json(red), 10)
         self.assertEqual(serializer.to_json(red, readable=True), "RED")
 
     def test_enum_wrap(self):
-        module = self.init_test_module()
-        status_cls = module["Status"]
+        status_cls = self.Status
         error = status_cls.wrap_error("An error occurred")
         self.assertEqual(error.kind, "error")
         self.assertEqual(error.value, "An error occurred")
         self.assertIs(error.union, error)
-        serializer = status_cls.SERIALIZER
-        self.assertEqual(serializer.to_json(error), [2, "An error occurred"])
+        serializer = self.StatusSerializer
+        self.assertListEqual(serializer.to_json(error), [2, "An error occurred"])
         self.assertEqual(
             serializer.to_json(error, readable=True),
             {"kind": "error", "value": "An error occurred"},
         )
 
     def test_enum_wrap_around_mutable_struct(self):
-        module = self.init_test_module()
-        json_value_cls = module["JsonValue"]
+        json_value_cls = self.JsonValue
         json_object_cls = json_value_cls.Object
         json_object = json_value_cls.wrap_object(json_object_cls().to_mutable())
         self.assertEqual(json_object.kind, "object")
@@ -681,56 +769,45 @@ class ModuleInitializerTestCase(unittest.TestCase):
             json_object, json_value_cls.wrap_object(json_object_cls.DEFAULT)
         )
 
-    def test_enum_to_json(self):
-        module = self.init_test_module()
-        status_cls = module["Status"]
-        serializer = status_cls.SERIALIZER
-        self.assertEqual(serializer.to_json(status_cls.UNKNOWN), 0)
-        self.assertEqual(serializer.to_json(status_cls.UNKNOWN, readable=True), "?")
-        self.assertEqual(serializer.to_json(status_cls.OK), 1)
-        self.assertEqual(serializer.to_json(status_cls.OK, readable=True), "OK")
-        self.assertEqual(serializer.to_json(status_cls.OK, readable=False), 1)
-        self.assertEqual(serializer.to_json(status_cls.wrap_error("E")), [2, "E"])
-        self.assertEqual(
-            serializer.to_json(status_cls.wrap_error("E"), readable=True),
-            {"kind": "error", "value": "E"},
-        )
+    def test_enum_json(self):
+        status_cls = self.Status
+        serializer = self.StatusSerializer
+        cases = [
+            (status_cls.UNKNOWN, 0, "?"),
+            (status_cls.OK, 1, "OK"),
+            (status_cls.wrap_error("E"), [2, "E"], {"kind": "error", "value": "E"}),
+        ]
+        for value, dense, readable in cases:
+            with self.subTest(repr(value)):
+                self.assertEqual(serializer.to_json(value), dense)
+                self.assertEqual(serializer.to_json(value, readable=False), dense)
+                self.assertEqual(serializer.to_json(value, readable=True), readable)
+                self.assertEqual(serializer.from_json(dense), value)
+                self.assertEqual(serializer.from_json(readable), value)
 
-    def test_enum_from_json(self):
-        module = self.init_test_module()
-        status_cls = module["Status"]
-        serializer = status_cls.SERIALIZER
-        self.assertEqual(serializer.from_json(0), status_cls.UNKNOWN)
-        self.assertEqual(serializer.from_json("?"), status_cls.UNKNOWN)
-        self.assertEqual(serializer.from_json(1), status_cls.OK)
-        self.assertEqual(serializer.from_json("OK"), status_cls.OK)
-        self.assertEqual(serializer.from_json([2, "E"]), status_cls.wrap_error("E"))
+    def test_enum_eq_and_hash(self):
+        status_cls = self.Status
+        serializer = self.StatusSerializer
+        unrecognized = serializer.from_json(100)
+        self.assertEqual(status_cls.OK, status_cls.OK)
+        self.assertNotEqual(status_cls.OK, status_cls.UNKNOWN)
+        self.assertNotEqual(status_cls.OK, unrecognized)
+        self.assertNotEqual(status_cls.OK, status_cls.wrap_error("E"))
+        self.assertNotEqual(status_cls.OK, 1)
+        self.assertEqual(status_cls.UNKNOWN, unrecognized)
+        self.assertEqual(unrecognized, status_cls.UNKNOWN)
+        self.assertEqual(hash(status_cls.UNKNOWN), hash(unrecognized))
+        self.assertEqual(len({status_cls.OK, status_cls.OK, status_cls.UNKNOWN}), 2)
         self.assertEqual(
-            serializer.from_json({"kind": "error", "value": "E"}),
-            status_cls.wrap_error("E"),
+            hash(status_cls.wrap_error("E")), hash(status_cls.wrap_error("E"))
         )
+        error = status_cls.wrap_error("E")
+        self.assertEqual(len({error, status_cls.wrap_error("E"), status_cls.OK}), 2)
 
     def test_complex_enum_from_json(self):
-        module = self.init_test_module()
-        json_value_cls = module["JsonValue"]
-        serializer = json_value_cls.SERIALIZER
-        json_value = serializer.from_json(
-            [
-                5,
-                [
-                    0,
-                    1,
-                    [2, True],
-                    [3, 3.14],
-                    [4, "foo"],
-                    [
-                        6,
-                        [["a", 0], ["b", 0]],
-                    ],
-                    [5, [[5, []]]],
-                ],
-            ]
-        )
+        json_value_cls = self.JsonValue
+        serializer = self.JsonValueSerializer
+        json_value = serializer.from_json(_COMPLEX_ENUM_JSON)
         self.assertEqual(
             json_value,
             json_value_cls.wrap_array(
@@ -757,32 +834,19 @@ class ModuleInitializerTestCase(unittest.TestCase):
             ),
         )
         self.assertEqual(
-            serializer.from_json(
-                {
-                    "kind": "array",
-                    "value": [
-                        "?",
-                        "NULL",
-                        {"kind": "bool", "value": True},
-                        {"kind": "number", "value": 3.14},
-                        {"kind": "string", "value": "foo"},
-                        {"kind": "object", "value": {"entries": [{}, {}]}},
-                        {"kind": "array", "value": [{"kind": "array", "value": []}]},
-                    ],
-                }
-            ),
+            serializer.from_json(_COMPLEX_ENUM_READABLE_JSON),
             json_value,
         )
 
     def test_struct_with_enum_field(self):
-        json_value_cls = self.init_test_module()["JsonValue"]
+        json_value_cls = self.JsonValue
         json_object_entry_cls = json_value_cls.ObjectEntry
         self.assertEqual(json_object_entry_cls.DEFAULT.value, json_value_cls.UNKNOWN)
         self.assertEqual(json_object_entry_cls().value, json_value_cls.UNKNOWN)
 
     def test_enum_with_unrecognized_and_removed_fields(self):
-        json_value_cls = self.init_test_module()["JsonValue"]
-        serializer = json_value_cls.SERIALIZER
+        json_value_cls = self.JsonValue
+        serializer = self.JsonValueSerializer
         json_value = serializer.from_json(100)  # removed
         self.assertEqual(json_value, json_value_cls.UNKNOWN)
         self.assertEqual(serializer.to_json(json_value), 0)
@@ -794,12 +858,21 @@ class ModuleInitializerTestCase(unittest.TestCase):
         self.assertEqual(serializer.to_json(json_value), 102)
         json_value = serializer.from_json([102, True])  # unrecognized
         self.assertEqual(json_value, json_value_cls.UNKNOWN)
-        self.assertEqual(serializer.to_json(json_value), [102, True])
+        self.assertListEqual(serializer.to_json(json_value), [102, True])
+
+    def test_enum_with_no_fields_from_json(self):
+        nested_enum_cls = self.Parent.NestedEnum
+        serializer = nested_enum_cls.SERIALIZER
+        self.assertIs(serializer.from_json(0), nested_enum_cls.UNKNOWN)
+        self.assertIs(serializer.from_json("?"), nested_enum_cls.UNKNOWN)
+        self.assertIs(serializer.from_json("FOO"), nested_enum_cls.UNKNOWN)
+        json_value = serializer.from_json(5)  # unrecognized
+        self.assertEqual(json_value, nested_enum_cls.UNKNOWN)
+        self.assertEqual(serializer.to_json(json_value), 5)
 
     def test_class_name(self):
-        module = self.init_test_module()
-        shape_cls = module["Shape"]
-        json_value_cls = module["JsonValue"]
+        shape_cls = self.Shape
+        json_value_cls = self.JsonValue
         json_object_cls = json_value_cls.Object
         self.assertEqual(shape_cls.__name__, "Shape")
         self.assertEqual(shape_cls.__qualname__, "Shape")
@@ -809,167 +882,72 @@ class ModuleInitializerTestCase(unittest.TestCase):
         self.assertEqual(json_object_cls.__qualname__, "JsonValue.Object")
 
     def test_struct_repr(self):
-        module = self.init_test_module()
-        point_cls = module["Point"]
-        self.assertEqual(
-            repr(point_cls(x=1.5)),
-            "Point(x=1.5)",
-        )
-        self.assertEqual(
-            repr(point_cls(x=1.5).to_mutable()),
-            "\n".join(
-                [
-                    "Point.Mutable(",
-                    "  x=1.5,",
-                    "  y=0.0,",
-                    ")",
-                ]
-            ),
-        )
-        self.assertEqual(
-            repr(point_cls(x=1.5, y=2.5)),
-            "\n".join(
-                [
-                    "Point(",
-                    "  x=1.5,",
-                    "  y=2.5,",
-                    ")",
-                ]
-            ),
-        )
-        self.assertEqual(
-            repr(point_cls()),
-            "Point()",
-        )
-        self.assertEqual(
-            repr(point_cls.DEFAULT),
-            "Point.DEFAULT",
-        )
-        self.assertEqual(
-            repr(point_cls.DEFAULT.to_mutable()),
-            "\n".join(
-                [
-                    "Point.Mutable(",
-                    "  x=0.0,",
-                    "  y=0.0,",
-                    ")",
-                ]
-            ),
-        )
-        shape_cls = module["Shape"]
-        self.assertEqual(
-            repr(shape_cls(points=[])),
-            "Shape()",
-        )
-        self.assertEqual(
-            repr(shape_cls(points=[]).to_mutable()),
-            "Shape.Mutable(points=[])",
-        )
-        self.assertEqual(
-            repr(shape_cls(points=[point_cls(x=1.5)])),
-            "\n".join(
-                [
-                    "Shape(",
-                    "  points=[",
-                    "    Point(x=1.5),",
-                    "  ],",
-                    ")",
-                ]
-            ),
-        )
-        self.assertEqual(
-            repr(
+        point_cls = self.Point
+        shape_cls = self.Shape
+        cases = [
+            (point_cls(x=1.5), "Point(x=1.5)"),
+            (point_cls(x=1.5).to_mutable(), _POINT_MUTABLE_REPR),
+            (point_cls(x=1.5, y=2.5), _POINT_REPR),
+            (point_cls(), "Point()"),
+            (point_cls.DEFAULT, "Point.DEFAULT"),
+            (point_cls.DEFAULT.to_mutable(), _DEFAULT_POINT_MUTABLE_REPR),
+            (shape_cls(points=[]), "Shape()"),
+            (shape_cls(points=[]).to_mutable(), "Shape.Mutable(points=[])"),
+            (shape_cls(points=[point_cls(x=1.5)]), _SHAPE_WITH_ONE_POINT_REPR),
+            (
                 shape_cls(
                     points=[
                         point_cls(x=1.5),
                         point_cls(y=2.5),
                     ],
-                )
-            ),
-            "\n".join(
-                [
-                    "Shape(",
-                    "  points=[",
-                    "    Point(x=1.5),",
-                    "    Point(y=2.5),",
-                    "  ],",
-                    ")",
-                ]
+                ),
+                _SHAPE_WITH_TWO_POINTS_REPR,
             ),
-        )
-        self.assertEqual(
-            repr(
+            (
                 shape_cls.Mutable(
                     points=[
                         point_cls(x=1.5),
                         point_cls(y=2.5).to_mutable(),
                     ]
-                )
-            ),
-            "\n".join(
-                [
-                    "Shape.Mutable(",
-                    "  points=[",
-                    "    Point(x=1.5),",
-                    "    Point.Mutable(",
-                    "      x=0.0,",
-                    "      y=2.5,",
-                    "    ),",
-                    "  ],",
-                    ")",
-                ]
+                ),
+                _SHAPE_MUTABLE_REPR,
             ),
-        )
+        ]
+        for value, expected in cases:
+            with self.subTest(expected=expected):
+                self.assertEqual(repr(value), expected)
 
     def test_enum_constant_repr(self):
-        module = self.init_test_module()
-        primary_color_cls = module["PrimaryColor"]
-        parent_cls = module["Parent"]
-        nested_enum_cls = parent_cls.NestedEnum
-        self.assertEqual(repr(primary_color_cls.UNKNOWN), "PrimaryColor.UNKNOWN")
-        self.assertEqual(repr(primary_color_cls.RED), "PrimaryColor.RED")
-        self.assertEqual(repr(nested_enum_cls.UNKNOWN), "Parent.NestedEnum.UNKNOWN")
+        primary_color_cls = self.PrimaryColor
+        nested_enum_cls = self.Parent.NestedEnum
+        cases = [
+            (primary_color_cls.UNKNOWN, "PrimaryColor.UNKNOWN"),
+            (primary_color_cls.RED, "PrimaryColor.RED"),
+            (nested_enum_cls.UNKNOWN, "Parent.NestedEnum.UNKNOWN"),
+        ]
+        for constant, expected in cases:
+            with self.subTest(expected=expected):
+                self.assertEqual(repr(constant), expected)
 
     def test_enum_value_repr(self):
-        module = self.init_test_module()
-        status_cls = module["Status"]
-        json_value_cls = module["JsonValue"]
+        status_cls = self.Status
+        json_value_cls = self.JsonValue
         json_object_cls = json_value_cls.Object
-        self.assertEqual(
-            repr(status_cls.wrap_error("An error")),
-            "Status.wrap_error('An error')",
-        )
-        self.assertEqual(
-            repr(status_cls.wrap_error("multiple\nlines\n")),
-            "\n".join(
-                [
-                    "Status.wrap_error(",
-                    "  '\\n'.join([",
-                    "    'multiple',",
-                    "    'lines',",
-                    "    '',",
-                    "  ])",
-                    ")",
-                ]
+        cases = [
+            (status_cls.wrap_error("An error"), "Status.wrap_error('An error')"),
+            (status_cls.wrap_error("multiple\nlines\n"), _MULTILINE_ERROR_REPR),
+            (
+                json_value_cls.wrap_object(json_object_cls.DEFAULT),
+                "JsonValue.wrap_object(JsonValue.Object.DEFAULT)",
             ),
-        )
-        self.assertEqual(
-            repr(json_value_cls.wrap_object(json_object_cls().DEFAULT)),
-            "JsonValue.wrap_object(JsonValue.Object.DEFAULT)",
-        )
-        self.assertEqual(
-            repr(json_value_cls.wrap_object(json_object_cls())),
-            "\n".join(
-                [
-                    "JsonValue.wrap_object(",
-                    "  JsonValue.Object()",
-                    ")",
-                ]
-            ),
-        )
+            (json_value_cls.wrap_object(json_object_cls()), _WRAPPED_OBJECT_REPR),
+        ]
+        for value, expected in cases:
+            with self.subTest(expected=expected):
+                self.assertEqual(repr(value), expected)
 
     def test_find_in_keyed_items(self):
-        json_value_cls = self.init_test_module()["JsonValue"]
+        json_value_cls = self.JsonValue
         object_cls = json_value_cls.Object
         entry_cls = json_value_cls.ObjectEntry
         json_object = object_cls(
@@ -995,16 +973,15 @@ class ModuleInitializerTestCase(unittest.TestCase):
         entries = json_object.entries
         self.assertIsInstance(entries, KeyedItems)
         self.assertIs(entries.find("foo"), entries[0])
-        self.assertIs(entries.find("zoo"), None)
+        self.assertIsNone(entries.find("zoo"))
         self.assertIs(entries.find("bar"), entries[3])
         self.assertIs(entries.find_or_default("foo"), entries[0])
         self.assertIs(entries.find_or_default("zoo"), entry_cls.DEFAULT)
 
     def test_find_in_keyed_items_with_complex_path(self):
-        module = self.init_test_module()
-        stuff_cls = module["Stuff"]
-        enum_wrapper_cls = module["EnumWrapper"]
-        status_cls = module["Status"]
+        stuff_cls = self.Stuff
+        enum_wrapper_cls = self.EnumWrapper
+        status_cls = self.Status
         stuff = stuff_cls(
             enum_wrappers=[
                 enum_wrapper_cls(
@@ -1018,25 +995,25 @@ class ModuleInitializerTestCase(unittest.TestCase):
                 ),
             ]
         )
-        enum_wrappers = stuff.enum_wrappers
-        self.assertIsInstance(enum_wrappers, KeyedItems)
-        self.assertIs(enum_wrappers.find("OK"), enum_wrappers[2])
-        self.assertIs(enum_wrappers.find("error"), enum_wrappers[1])
-        self.assertIs(enum_wrappers.find_or_default("?"), enum_wrapper_cls.DEFAULT)
-        enum_wrappers = stuff.to_mutable().to_frozen().enum_wrappers
-        self.assertIs(enum_wrappers.find("error"), enum_wrappers[1])
+        for variant in (stuff, stuff.to_mutable().to_frozen()):
+            enum_wrappers = variant.enum_wrappers
+            self.assertIsInstance(enum_wrappers, KeyedItems)
+            self.assertIs(enum_wrappers.find("OK"), enum_wrappers[2])
+            self.assertIs(enum_wrappers.find("error"), enum_wrappers[1])
+            self.assertIs(
+                enum_wrappers.find_or_default("?"), enum_wrapper_cls.DEFAULT
+            )
 
     def test_name_overrides(self):
-        name_overrides_cls = self.init_test_module()["Stuff"].NameOverrides
+        name_overrides_cls = self.Stuff.NameOverrides
         name_overrides = name_overrides_cls(y=3)
         self.assertEqual(name_overrides.y, 3)
         self.assertEqual(name_overrides_cls.__name__, "NameOverrides")
         self.assertEqual(name_overrides_cls.__qualname__, "Stuff.NameOverrides")
 
     def test_mutable_getter_of_struct(self):
-        module = self.init_test_module()
-        segment_cls = module["Segment"]
-        point_cls = module["Point"]
+        segment_cls = self.Segment
+        point_cls = self.Point
         segment = segment_cls(
             a=point_cls(x=1.0, y=2.0),
             b=point_cls(x=3.0, y=4.0),
@@ -1045,16 +1022,14 @@ class ModuleInitializerTestCase(unittest.TestCase):
         self.assertIsInstance(a, point_cls.Mutable)
         self.assertIs(segment.mutable_a, a)
         segment.a = "foo"
-        try:
-            segment.mutable_a()
-            self.fail("Expected to fail")
-        except TypeError as e:
-            self.assertEqual(str(e), "expected: Point or Point.Mutable; found: str")
+        with self.assertRaisesRegex(
+            TypeError, r"^expected: Point or Point\.Mutable; found: str$"
+        ):
+            segment.mutable_a
 
     def test_mutable_getter_of_array(self):
-        module = self.init_test_module()
-        shape_cls = module["Shape"]
-        point_cls = module["Point"]
+        shape_cls = self.Shape
+        point_cls = self.Point
         shape = shape_cls(
             points=[
                 point_cls(x=1.0, y=2.0),
@@ -1066,30 +1041,22 @@ class ModuleInitializerTestCase(unittest.TestCase):
         self.assertIs(shape.mutable_points, points)
 
     def test_methods(self):
-        module = self.init_test_module()
-        first_method = module["FirstMethod"]
-        self.assertEqual(
-            first_method,
-            Method(
-                name="FirstMethod",
-                number=-300,
-                request_serializer=module["Point"].SERIALIZER,
-                response_serializer=module["Shape"].SERIALIZER,
-            ),
-        )
-        second_method = module["MethodVar"]
-        self.assertEqual(
-            second_method,
-            Method(
-                name="SecondMethod",
-                number=-301,
-                request_serializer=module["Point"].SERIALIZER,
-                response_serializer=module["Shape"].SERIALIZER,
-            ),
-        )
+        cases = [
+            (self.FirstMethod, "FirstMethod", -300),
+            (self.MethodVar, "SecondMethod", -301),
+        ]
+        for method, name, number in cases:
+            with self.subTest(name):
+                self.assertEqual(
+                    method,
+                    Method(
+                        name=name,
+                        number=number,
+                        request_serializer=self.PointSerializer,
+                        response_serializer=self.ShapeSerializer,
+                    ),
+                )
 
     def test_constants(self):
-        module = self.init_test_module()
-        c = module["C"]
-        Point = module["Point"]
-        self.assertEqual(c, Point(x=1.5, y=2.5))
+        point_cls = self.Point
+        self.assertEqual(self.C, point_cls(x=1.5, y=2.5))
@@ -74,3 +74,20 @@ class TimestampTestCase(unittest.TestCase):
             optional_serializer(primitive_serializer("bool")).to_json_code(None),
             "null",
         )
+
+    def test_array_serializer_is_cached(self):
+        self.assertIs(
+            array_serializer(primitive_serializer("bool")),
+            array_serializer(primitive_serializer("bool")),
+        )
+
+    def test_optional_of_optional_serializer(self):
+        optional_bool = optional_serializer(primitive_serializer("bool"))
+        self.assertIs(optional_serializer(optional_bool), optional_bool)
+
+    def test_to_dense_and_readable_json(self):
+        serializer = primitive_serializer("bool")
+        self.assertEqual(serializer.to_dense_json(True), 1)
+        self.assertEqual(serializer.to_readable_json(True), True)
+        self.assertEqual(serializer.to_json(True), 1)
+        self.assertEqual(serializer.to_json(True, readable=True), True)
@@ -28,7 +28,7 @@ class TimestampTestCase(unittest.TestCase):
     def test_epoch(self):
         self.assertEqual(Timestamp.EPOCH.unix_millis, 0)
 
-    def round_millis(self):
+    def test_round_millis(self):
         unix_millis: Any = 200.8
         ts = Timestamp(unix_millis=unix_millis)
         self.assertEqual(ts.unix_millis, 201)